@@ -1,25 +1,107 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.contrib.auth.hashers import make_password
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import Lower
+
+from accounts.hashing import LoginOverloaded, adummy_hash, averify_password, get_hash_pool
+from accounts.models.user import normalize_phone, normalized_phone
+
+
+def login_lookup(identifier):
+    """Q matching a username, email or phone, each through its own functional index.
+
+    Every branch compares the exact indexed expression with a constant, so
+    PostgreSQL combines the three index scans with a BitmapOr instead of
+    scanning the table.
+    """
+    lookup = Q(login_username=Lower(Value(identifier))) | Q(login_email=Lower(Value(identifier)))
+    phone = normalize_phone(identifier)
+    if phone:
+        lookup |= Q(login_phone=phone)
+    return lookup
+
+
+def login_users(identifier):
+    """Users ``identifier`` names, an exact username match first."""
+    UserModel = get_user_model()
+    return (
+        UserModel.objects.alias(
+            login_username=Lower("username"),
+            login_email=Lower("email"),
+            login_phone=normalized_phone("phone"),
+        )
+        .filter(login_lookup(identifier))
+        .order_by(Case(When(username=identifier, then=Value(0)), default=Value(1)))
+    )
+
+
+def _one_login_user(users, identifier):
+    # When several match, an exact username wins, as it did with ModelBackend.
+    if len(users) == 1 or (users and users[0].username == identifier):
+        return users[0]
+    return None
+
+
+def get_login_user(identifier):
+    """Return the one user ``identifier`` names, or None if none or several match."""
+    return _one_login_user(list(login_users(identifier)[:2]), identifier)
+
+
+async def aget_login_user(identifier):
+    """See get_login_user()."""
+    return _one_login_user([user async for user in login_users(identifier)[:2]], identifier)
 
 
 class UsernameEmailPhoneBackend(ModelBackend):
+    """The only authentication backend: one lookup and one password hash per attempt.
+
+    Usernames are covered by the identifier lookup, so ModelBackend is not
+    listed after it; a failed login would otherwise be looked up and hashed
+    twice. Permissions still come from ModelBackend through inheritance.
+    """
+
     def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None:
             username = kwargs.get("email") or kwargs.get("phone")
         if username is None or password is None:
             return None
 
-        UserModel = get_user_model()
-        try:
-            user = UserModel.objects.get(
-                Q(username__iexact=username)
-                | Q(email__iexact=username)
-                | Q(phone__iexact=username)
-            )
-        except UserModel.DoesNotExist:
+        user = get_login_user(username)
+        if user is None:
+            # Hash anyway so unknown identifiers take as long as wrong passwords.
+            get_user_model()().set_password(password)
             return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
             return user
         return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """authenticate() with the password hash run in the login hash pool.
+
+        Raises LoginOverloaded, before touching the database, when the pool
+        cannot take another hash.
+        """
+        if username is None:
+            username = kwargs.get("email") or kwargs.get("phone")
+        if username is None or password is None:
+            return None
+        if get_hash_pool().full():
+            raise LoginOverloaded
+
+        user = await aget_login_user(username)
+        if user is None:
+            await adummy_hash(password)
+            return None
+
+        is_correct, must_update = await averify_password(password, user.password)
+        if not is_correct:
+            return None
+        if must_update:
+            # Upgrade the stored hash, as check_password()'s setter would.
+            user.password = await get_hash_pool().run(make_password, password)
+            await user.asave(update_fields=["password"])
+        if self.user_can_authenticate(user):
+            return user
+        return None
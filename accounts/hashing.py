@@ -0,0 +1,56 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+class LoginOverloaded(Exception):
+    """Every hashing worker is busy and the wait queue is full."""
+
+
+class HashPool:
+    """A bounded thread pool for password hashing, with admission control.
+
+    PBKDF2 (and bcrypt/argon2) release the GIL while hashing, so threads run
+    in parallel and the event loop keeps serving other requests. At most
+    ``workers + queue`` hashes are running or waiting; past that, ``run()``
+    raises LoginOverloaded at once instead of queueing without bound.
+    """
+
+    def __init__(self, workers, queue):
+        self.limit = workers + queue
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login-hash")
+
+    def full(self):
+        return self.pending >= self.limit
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.pending >= self.limit:
+                raise LoginOverloaded
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+
+@functools.cache
+def get_hash_pool():
+    return HashPool(settings.LOGIN_HASH_WORKERS, settings.LOGIN_HASH_QUEUE)
+
+
+async def averify_password(password, encoded):
+    """verify_password() in the hash pool: ``(is_correct, must_update)``."""
+    return await get_hash_pool().run(verify_password, password, encoded)
+
+
+async def adummy_hash(password):
+    """Hash ``password`` once and discard it, so misses cost as much as hits."""
+    await get_hash_pool().run(make_password, password)
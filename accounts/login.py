@@ -0,0 +1,98 @@
+import orjson
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY, alogin
+from django.contrib.auth.signals import user_logged_in
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import UnsupportedMediaType
+from rest_framework.settings import api_settings
+
+from core.renderers import ORJSONRenderer
+from core.responses import json_response
+
+# Seconds a client should wait after a 503 from an overloaded login pool.
+RETRY_AFTER = 1
+FORM_CONTENT_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+
+
+def request_data(request):
+    """The JSON or form body of ``request``; raises ValueError on malformed JSON.
+
+    Raises UnsupportedMediaType for any other content type.
+    """
+    if request.content_type == "application/json":
+        return orjson.loads(request.body) if request.body else {}
+    if request.content_type in FORM_CONTENT_TYPES:
+        return request.POST
+    raise UnsupportedMediaType(request.content_type)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class LoginView(View):
+    """Base for the async login APIs, which are plain Django views, not APIViews.
+
+    Exceptions still go through REST_FRAMEWORK's EXCEPTION_HANDLER, so errors
+    keep the ``{ok, message}`` envelope and DRF's status codes (e.g. 415).
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def handle_exception(self, exc):
+        context = {"view": self, "args": self.args, "kwargs": self.kwargs, "request": self.request}
+        response = api_settings.EXCEPTION_HANDLER(exc, context)
+        if response is None:
+            raise exc
+        rendered = HttpResponse(
+            ORJSONRenderer().render(response.data),
+            status=response.status_code,
+            content_type=ORJSONRenderer.media_type,
+        )
+        for header, value in response.items():
+            if header.lower() != "content-type":
+                rendered[header] = value
+        return rendered
+
+
+def overloaded_response():
+    response = json_response(
+        ok=False,
+        message="Too many logins in progress, try again shortly",
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+    response["Retry-After"] = str(RETRY_AFTER)
+    return response
+
+
+def throttled_response(retry_after):
+    response = json_response(
+        ok=False,
+        message="Too many login attempts, try again later",
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+async def alogin_api(request, user):
+    """Log ``user`` in for an API login that also returns JWTs.
+
+    With LOGIN_API_SESSIONS off no session row is written and no key rotated,
+    since token clients never send the cookie. A session that belongs to
+    another user is still flushed, as login() would, so it cannot outlive
+    this login. ``user_logged_in`` still fires, so ``last_login`` stays current.
+    """
+    if settings.LOGIN_API_SESSIONS:
+        await alogin(request, user)
+        return
+    session_user = await request.session.aget(SESSION_KEY)
+    if session_user is not None and session_user != user._meta.pk.value_to_string(user):
+        await request.session.aflush()
+    request.user = user
+    await user_logged_in.asend(sender=user.__class__, request=request, user=user)
@@ -0,0 +1,109 @@
+import logging
+import time
+import uuid
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.models.company import Company
+from accounts.models.owner import Owner
+from accounts.models.staff import Staff
+from accounts.models.worker import Worker
+from accounts.throttle import get_login_throttle
+
+BACKENDS = {
+    "single-pass": ["accounts.backends.UsernameEmailPhoneBackend"],
+    # What AUTHENTICATION_BACKENDS used to list.
+    "legacy": ["accounts.backends.UsernameEmailPhoneBackend", "django.contrib.auth.backends.ModelBackend"],
+}
+PASSWORD = "bench-password"
+# Far above what the benchmark sends, so no attempt is throttled.
+NO_THROTTLE = (10**9, 60)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput and password hashes per attempt for OwnerLoginView, StaffLoginView "
+        "and worker_login, with the single backend and the old two-backend setup. Runs in a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attempts", type=int, default=10, help="Logins per endpoint and outcome.")
+        parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+
+    def handle(self, *args, **options):
+        if options["attempts"] < 1:
+            raise CommandError("--attempts must be at least 1.")
+        # Every failed attempt would log "Unauthorized".
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        try:
+            with transaction.atomic():
+                endpoints = self._endpoints()
+                with override_settings(
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                    LOGIN_THROTTLE_IDENTIFIER_RATE=NO_THROTTLE,
+                    LOGIN_THROTTLE_IP_RATE=NO_THROTTLE,
+                    LOGIN_THROTTLE_CACHE=None,
+                ):
+                    get_login_throttle.cache_clear()
+                    for name in options["backends"]:
+                        with override_settings(AUTHENTICATION_BACKENDS=BACKENDS[name]):
+                            for endpoint in endpoints:
+                                self._run(name, endpoint, options["attempts"])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            get_login_throttle.cache_clear()
+
+    @staticmethod
+    def _endpoints():
+        suffix = uuid.uuid4().hex[:8]
+        User = get_user_model()
+        owner = User.objects.create_user(username=f"bench_owner_{suffix}", password=PASSWORD)
+        Owner.objects.create(user=owner)
+        company = Company.objects.create(name=f"Bench {suffix}", owner=owner)
+        staff = User.objects.create_user(username=f"bench_staff_{suffix}", password=PASSWORD)
+        Staff.objects.create(user=staff, company=company)
+        worker = User.objects.create_user(username=f"bench_worker_{suffix}", password=PASSWORD)
+        Worker.objects.create(user=worker)
+        return [
+            ("OwnerLoginView", reverse("owner-login"), "json", owner.username),
+            ("StaffLoginView", reverse("staff-login"), "json", staff.username),
+            ("worker_login", reverse("worker-login-submit"), "form", worker.username),
+        ]
+
+    def _run(self, backends, endpoint, attempts):
+        name, url, body, username = endpoint
+        hasher = type(get_hasher())
+        outcomes = (
+            ("success", username, PASSWORD),
+            ("wrong password", username, "wrong"),
+            ("unknown login", f"nobody_{uuid.uuid4().hex[:8]}", PASSWORD),
+        )
+        for outcome, login, password in outcomes:
+            client = Client()
+            data = {"login": login, "password": password}
+            with mock.patch.object(hasher, "encode", autospec=True, side_effect=hasher.encode) as encode:
+                started = time.perf_counter()
+                for _ in range(attempts):
+                    if body == "json":
+                        response = client.post(url, data, content_type="application/json")
+                    else:
+                        response = client.post(url, data)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{backends:>11} {name:>14} {outcome:>14}: {attempts / elapsed:6.2f} logins/s, "
+                f"{encode.call_count / attempts:.1f} hashes/attempt (HTTP {response.status_code})"
+            )
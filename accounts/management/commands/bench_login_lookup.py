@@ -0,0 +1,106 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Q
+
+from accounts.backends import get_login_user, login_users
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_login_user(identifier):
+    """The lookup UsernameEmailPhoneBackend used before the functional indexes."""
+    UserModel = get_user_model()
+    users = list(
+        UserModel.objects.filter(
+            Q(username__iexact=identifier) | Q(email__iexact=identifier) | Q(phone__iexact=identifier)
+        )[:2]
+    )
+    return users[0] if len(users) == 1 else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Time login identifier lookups as the user table grows. Inserts synthetic users inside a "
+        "transaction that is rolled back, so it is safe to point at a development database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+        parser.add_argument("--lookups", type=int, default=500)
+        parser.add_argument(
+            "--legacy-lookups",
+            type=int,
+            default=20,
+            help="Lookups timed with the old OR of iexact comparisons (0 to skip).",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("The benchmark needs PostgreSQL.")
+        if sorted(options["sizes"]) != options["sizes"] or options["sizes"][0] < 1:
+            raise CommandError("--sizes must be positive and ascending.")
+
+        try:
+            with transaction.atomic(using=options["database"]):
+                inserted = 0
+                for size in options["sizes"]:
+                    self._grow(connection, inserted + 1, size)
+                    inserted = size
+                    self._report(size, options)
+                self.stdout.write(login_users(f"bench_user_{inserted}")[:2].explain())
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _grow(connection, first, last):
+        table = connection.ops.quote_name(get_user_model()._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (password, is_superuser, username, first_name, last_name, is_staff, "
+                f"is_active, date_joined, is_removed, email, phone) "
+                f"SELECT '!', false, 'bench_user_' || n, '', '', false, true, now(), false, "
+                f"'Bench_User_' || n || '@example.com', '+1 (555) ' || lpad(n::text, 8, '0') "
+                f"FROM generate_series(%s, %s) AS n",
+                [first, last],
+            )
+            cursor.execute(f"ANALYZE {table}")
+
+    def _report(self, size, options):
+        rng = random.Random(size)
+        identifiers = []
+        for _ in range(options["lookups"]):
+            n = rng.randint(1, size)
+            identifiers.append(
+                rng.choice(
+                    (
+                        f"BENCH_USER_{n}",
+                        f"bench_user_{n}@example.com",
+                        f"+1 555-{n:08d}",
+                        f"nobody_{n}",
+                    )
+                )
+            )
+        timings = [self._time(get_login_user, identifier) for identifier in identifiers]
+        line = f"{size:>8} users: indexed median {statistics.median(timings) * 1e6:8.0f} us"
+        if options["legacy_lookups"]:
+            legacy = [
+                self._time(legacy_login_user, identifier) for identifier in identifiers[: options["legacy_lookups"]]
+            ]
+            line += f", legacy median {statistics.median(legacy) * 1e6:10.0f} us"
+        self.stdout.write(line)
+
+    @staticmethod
+    def _time(lookup, identifier):
+        started = time.perf_counter()
+        lookup(identifier)
+        return time.perf_counter() - started
@@ -0,0 +1,46 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_alter_staff_company"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="user",
+            options={"verbose_name": "user", "verbose_name_plural": "users"},
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(django.db.models.functions.text.Lower("username"), name="user_username_lower_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(django.db.models.functions.text.Lower("email"), name="user_email_lower_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Replace(
+                    django.db.models.functions.text.Replace(
+                        django.db.models.functions.text.Replace(
+                            django.db.models.functions.text.Replace(
+                                django.db.models.functions.text.Replace("phone", models.Value(" "), models.Value("")),
+                                models.Value("-"),
+                                models.Value(""),
+                            ),
+                            models.Value("("),
+                            models.Value(""),
+                        ),
+                        models.Value(")"),
+                        models.Value(""),
+                    ),
+                    models.Value("."),
+                    models.Value(""),
+                ),
+                name="user_phone_normalized_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+PHONE_SEPARATORS = (" ", "-", "(", ")", ".")
+
+
+def check_normalized_phones(apps, schema_editor):
+    """Stop before the constraint if phones already collide once separators are dropped."""
+    User = apps.get_model("accounts", "User")
+    users_by_phone = {}
+    for user_id, phone in User._base_manager.exclude(phone=None).values_list("id", "phone").iterator():
+        for separator in PHONE_SEPARATORS:
+            phone = phone.replace(separator, "")
+        users_by_phone.setdefault(phone, []).append(user_id)
+    duplicates = {phone: ids for phone, ids in users_by_phone.items() if len(ids) > 1}
+    if duplicates:
+        listed = "; ".join(f"{phone}: users {', '.join(map(str, ids))}" for phone, ids in sorted(duplicates.items()))
+        raise RuntimeError(
+            "Users share a phone number once spaces, dashes, dots and parentheses are removed. Change or clear "
+            f"all but one of each before migrating: {listed}"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_user_login_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_normalized_phones, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Replace(
+                    django.db.models.functions.text.Replace(
+                        django.db.models.functions.text.Replace(
+                            django.db.models.functions.text.Replace(
+                                django.db.models.functions.text.Replace("phone", models.Value(" "), models.Value("")),
+                                models.Value("-"),
+                                models.Value(""),
+                            ),
+                            models.Value("("),
+                            models.Value(""),
+                        ),
+                        models.Value(")"),
+                        models.Value(""),
+                    ),
+                    models.Value("."),
+                    models.Value(""),
+                ),
+                name="user_phone_normalized_uniq",
+                violation_error_message="A user with this phone number already exists.",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_phone_normalized_idx",
+        ),
+    ]
@@ -1,7 +1,25 @@
+from functools import reduce
+
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower, Replace
 from model_utils.models import SoftDeletableModel, SoftDeletableManager
 
+# Characters people type inside phone numbers that never distinguish two numbers.
+PHONE_SEPARATORS = (" ", "-", "(", ")", ".")
+
+
+def normalize_phone(phone):
+    for separator in PHONE_SEPARATORS:
+        phone = phone.replace(separator, "")
+    return phone
+
+
+def normalized_phone(expression):
+    """SQL counterpart of ``normalize_phone()``; matches user_phone_normalized_uniq."""
+    return reduce(lambda inner, separator: Replace(inner, Value(separator), Value("")), PHONE_SEPARATORS, expression)
+
 
 class SoftDeletableUserManager(UserManager, SoftDeletableManager):
     pass
@@ -13,5 +31,22 @@ class User(SoftDeletableModel, AbstractUser):
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=30, blank=True, null=True, unique=True)
 
+    class Meta(AbstractUser.Meta):
+        # Login identifiers are looked up case-insensitively (and phones without
+        # separators), so each gets an index on exactly that expression.
+        indexes = [
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+            models.Index(Lower("email"), name="user_email_lower_idx"),
+        ]
+        constraints = [
+            # Phones that differ only in separators would make a phone login
+            # ambiguous; the constraint's unique index also serves the lookup.
+            models.UniqueConstraint(
+                normalized_phone("phone"),
+                name="user_phone_normalized_uniq",
+                violation_error_message="A user with this phone number already exists.",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.get_username()
@@ -1,3 +1,74 @@
-from django.test import TestCase
+from django.test import RequestFactory, SimpleTestCase
 
-# Create your tests here.
+from accounts.throttle import MemoryStore, _estimate, _identifier_key, _ip_key, _retry_after
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def test_estimate_weights_previous_window_by_overlap(self):
+        self.assertEqual(_estimate(10, 2, 0, 60), 12)
+        self.assertEqual(_estimate(10, 2, 15, 60), 9.5)
+        self.assertEqual(_estimate(10, 2, 60, 60), 2)
+
+    def test_retry_after_while_previous_window_slides_out(self):
+        # 10 * (1 - t / 60) + 2 < 5 once t > 42.
+        self.assertEqual(_retry_after(10, 2, 15, 60, 5), 28)
+        self.assertLess(_estimate(10, 2, 15 + 28, 60), 5)
+        self.assertGreaterEqual(_estimate(10, 2, 15 + 27, 60), 5)
+
+    def test_retry_after_full_current_window(self):
+        # The 6 attempts become the previous window at full weight, then
+        # 6 * (1 - t / 60) < 5 once t > 10 into the next window.
+        self.assertEqual(_retry_after(0, 6, 15, 60, 5), 45 + 10 + 1)
+        self.assertEqual(_retry_after(0, 5, 15, 60, 5), 45 + 1)
+
+
+class MemoryStoreTests(SimpleTestCase):
+    async def test_limit_boundary(self):
+        store = MemoryStore(max_keys=10)
+        results = [await store.hit("key", 3, 60, 600.0) for _ in range(4)]
+        self.assertEqual(results[:3], [0, 0, 0])
+        self.assertEqual(results[3], 61)
+
+    async def test_previous_window_counts_towards_limit(self):
+        store = MemoryStore(max_keys=10)
+        for _ in range(4):
+            await store.hit("key", 5, 60, 600.0)
+        # Halfway into the next window the 4 earlier attempts weigh 2.
+        results = [await store.hit("key", 5, 60, 690.0) for _ in range(4)]
+        self.assertEqual(results[:3], [0, 0, 0])
+        # 4 * (1 - t / 60) + 3 < 5 once t > 30.
+        self.assertEqual(results[3], 1)
+        # Two windows later nothing is left.
+        self.assertEqual(await store.hit("key", 5, 60, 780.0), 0)
+
+    async def test_reset(self):
+        store = MemoryStore(max_keys=10)
+        await store.hit("key", 1, 60, 600.0)
+        await store.reset("key", 60, 600.0)
+        self.assertEqual(await store.hit("key", 1, 60, 600.0), 0)
+
+    async def test_evicts_least_recently_used_key(self):
+        store = MemoryStore(max_keys=2)
+        for key in ("a", "b", "a", "c"):
+            await store.hit(key, 5, 60, 600.0)
+        self.assertEqual(list(store._counters), ["a", "c"])
+
+
+class ThrottleKeyTests(SimpleTestCase):
+    def test_usernames_and_emails_keep_their_separators(self):
+        self.assertNotEqual(_identifier_key("j.smith"), _identifier_key("jsmith"))
+        self.assertNotEqual(_identifier_key("a-b@x.com"), _identifier_key("ab@x.com"))
+        self.assertEqual(_identifier_key(" J.Smith "), _identifier_key("j.smith"))
+
+    def test_phone_variants_share_a_key(self):
+        key = _identifier_key("+15550102030")
+        self.assertEqual(_identifier_key("+1 (555) 010-2030"), key)
+        self.assertEqual(_identifier_key(" +1.555.010.2030 "), key)
+        self.assertNotEqual(_identifier_key("15550102030"), key)
+
+    def test_ip_key_behind_trusted_proxies(self):
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="203.0.113.7, 10.0.0.2", REMOTE_ADDR="10.0.0.3")
+        self.assertEqual(_ip_key(request, 0), ("ip", "10.0.0.3"))
+        self.assertEqual(_ip_key(request, 1), ("ip", "10.0.0.2"))
+        self.assertEqual(_ip_key(request, 2), ("ip", "203.0.113.7"))
+        self.assertEqual(_ip_key(request, 5), ("ip", "203.0.113.7"))
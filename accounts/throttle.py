@@ -0,0 +1,161 @@
+import functools
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from accounts.models.user import normalize_phone
+
+# Digits and PHONE_SEPARATORS, with an optional leading "+".
+_PHONE_LIKE = re.compile(r"\+?[\d \-().]*\d[\d \-().]*")
+
+
+def _estimate(previous, current, elapsed, window):
+    # Sliding window counter: the previous window's count, weighted by how
+    # much of it still overlaps the window ending now, plus the current one.
+    return previous * (1 - elapsed / window) + current
+
+
+def _retry_after(previous, current, elapsed, window, limit):
+    """Whole seconds until the estimate is below ``limit``, if nothing else is counted."""
+    if current < limit:
+        # previous * (1 - t / window) + current < limit, still in this window.
+        wait = (1 - (limit - current) / previous) * window - elapsed
+    else:
+        # Only once the current window is the previous one and has slid far
+        # enough: current * (1 - t / window) < limit.
+        wait = window - elapsed + (1 - limit / current) * window
+    return math.floor(wait) + 1
+
+
+class MemoryStore:
+    """Per-process counters: three numbers per key, least recently used keys evicted."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key, limit, window, now):
+        bucket, elapsed = divmod(now, window)
+        with self._lock:
+            start, previous, current = self._counters.pop(key, (bucket, 0, 0))
+            if start == bucket - 1:
+                previous, current = current, 0
+            elif start != bucket:
+                previous, current = 0, 0
+            estimate = _estimate(previous, current, elapsed, window)
+            if estimate < limit:
+                current += 1
+            self._counters[key] = (bucket, previous, current)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        if estimate >= limit:
+            return _retry_after(previous, current, elapsed, window, limit)
+        return 0
+
+    async def reset(self, key, window, now):
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class CacheStore:
+    """Counters in a Django cache shared by every process, one entry per key and window."""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    @staticmethod
+    def _key(key, bucket):
+        kind, value = key
+        digest = hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+        return f"login-throttle:{kind}:{digest}:{bucket:.0f}"
+
+    async def hit(self, key, limit, window, now):
+        bucket, elapsed = divmod(now, window)
+        previous_key, current_key = self._key(key, bucket - 1), self._key(key, bucket)
+        counts = await self.cache.aget_many([previous_key, current_key])
+        previous, current = counts.get(previous_key, 0), counts.get(current_key, 0)
+        if _estimate(previous, current, elapsed, window) >= limit:
+            return _retry_after(previous, current, elapsed, window, limit)
+        # Kept for two windows: one as current, one as previous.
+        await self.cache.aadd(current_key, 0, timeout=math.ceil(2 * window))
+        try:
+            await self.cache.aincr(current_key)
+        except ValueError:
+            # Evicted between add() and incr(); losing one count is harmless.
+            pass
+        return 0
+
+    async def reset(self, key, window, now):
+        bucket = now // window
+        await self.cache.adelete_many([self._key(key, bucket - 1), self._key(key, bucket)])
+
+
+def _identifier_key(identifier):
+    # Variants of one identifier share a count: case for usernames and emails,
+    # separators for phone numbers. Only phone-like identifiers lose their
+    # separators, so e.g. "j.smith" and "jsmith" keep separate counts.
+    identifier = identifier.strip().lower()
+    if _PHONE_LIKE.fullmatch(identifier):
+        return ("identifier", normalize_phone(identifier))
+    return ("identifier", identifier)
+
+
+def _ip_key(request, num_proxies):
+    # Like DRF's NUM_PROXIES: behind ``num_proxies`` trusted proxies the client
+    # is the address the outermost of them appended to X-Forwarded-For.
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if num_proxies and forwarded_for:
+        addresses = forwarded_for.split(",")
+        return ("ip", addresses[-min(num_proxies, len(addresses))].strip())
+    return ("ip", request.META.get("REMOTE_ADDR") or "")
+
+
+class LoginThrottle:
+    """Sliding-window limits on login attempts per client IP and per identifier.
+
+    ``check()`` only touches the counter store, so throttled attempts are
+    rejected before any user lookup or password hash.
+    """
+
+    def __init__(self, store, identifier_rate, ip_rate, num_proxies=0):
+        self.store = store
+        self.identifier_rate = identifier_rate
+        self.ip_rate = ip_rate
+        self.num_proxies = num_proxies
+
+    async def check(self, request, identifier):
+        """Count this attempt; return seconds to wait if it is over a limit, else 0."""
+        now = time.time()
+        for key, (limit, window) in (
+            (_ip_key(request, self.num_proxies), self.ip_rate),
+            (_identifier_key(identifier), self.identifier_rate),
+        ):
+            retry_after = await self.store.hit(key, limit, window, now)
+            if retry_after:
+                return retry_after
+        return 0
+
+    async def reset(self, identifier):
+        """Forget the identifier's attempts after a successful login."""
+        await self.store.reset(_identifier_key(identifier), self.identifier_rate[1], time.time())
+
+
+@functools.cache
+def get_login_throttle():
+    if settings.LOGIN_THROTTLE_CACHE:
+        store = CacheStore(settings.LOGIN_THROTTLE_CACHE)
+    else:
+        store = MemoryStore(settings.LOGIN_THROTTLE_MAX_KEYS)
+    return LoginThrottle(
+        store,
+        settings.LOGIN_THROTTLE_IDENTIFIER_RATE,
+        settings.LOGIN_THROTTLE_IP_RATE,
+        num_proxies=settings.LOGIN_THROTTLE_NUM_PROXIES,
+    )
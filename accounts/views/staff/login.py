@@ -1,11 +1,12 @@
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import aauthenticate
 from rest_framework import serializers, status
-from rest_framework.permissions import AllowAny
-from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.hashing import LoginOverloaded
+from accounts.login import LoginView, alogin_api, overloaded_response, request_data, throttled_response
 from accounts.models.staff import Staff
-from core.responses import api_response
+from accounts.throttle import get_login_throttle
+from core.responses import json_response
 
 
 class StaffLoginSerializer(serializers.Serializer):
@@ -22,15 +23,22 @@ class StaffLoginSerializer(serializers.Serializer):
         return attrs
 
 
-class StaffLoginView(APIView):
-    permission_classes = [AllowAny]
-    authentication_classes = []
+class StaffLoginView(LoginView):
     serializer_class = StaffLoginSerializer
 
-    def post(self, request):
-        serializer = self.serializer_class(data=request.data)
+    async def post(self, request):
+        try:
+            data = request_data(request)
+        except ValueError:
+            return json_response(
+                ok=False,
+                message="Malformed request body",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.serializer_class(data=data)
         if not serializer.is_valid():
-            return api_response(
+            return json_response(
                 ok=False,
                 message="Missing credentials",
                 errors=serializer.errors,
@@ -39,29 +47,38 @@ class StaffLoginView(APIView):
 
         username = serializer.validated_data["resolved_login"]
         password = serializer.validated_data["password"]
-        user = authenticate(request, username=username, password=password)
+        throttle = get_login_throttle()
+        retry_after = await throttle.check(request, username)
+        if retry_after:
+            return throttled_response(retry_after)
+
+        try:
+            user = await aauthenticate(request, username=username, password=password)
+        except LoginOverloaded:
+            return overloaded_response()
         if user is None:
-            return api_response(
+            return json_response(
                 ok=False,
                 message="Invalid credentials",
                 status=status.HTTP_401_UNAUTHORIZED,
             )
+        await throttle.reset(username)
 
-        staff = Staff.objects.filter(user=user).select_related("company").first()
+        staff = await Staff.objects.filter(user=user).select_related("company", "user").afirst()
         if staff is None or not staff.is_active:
-            return api_response(
+            return json_response(
                 ok=False,
                 message="Staff access denied",
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        login(request, user)
+        await alogin_api(request, user)
         refresh = RefreshToken.for_user(user)
         refresh["role"] = "staff"
         access = refresh.access_token
         access["role"] = "staff"
         display_name = (str(staff) if staff else None) or user.get_full_name() or user.get_username()
-        return api_response(
+        return json_response(
             ok=True,
             message="Login success",
             data={
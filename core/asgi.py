@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+if os.getenv("DJANGO_ENV") == "prod":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.prod")  # noqa
+else:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.dev")  # noqa
+
 
 application = get_asgi_application()
@@ -0,0 +1,26 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser backed by orjson; NaN and Infinity are rejected."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        body = stream.read() if stream is not None else b""
+        try:
+            if codecs.lookup(encoding).name != "utf-8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, LookupError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
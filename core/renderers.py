@@ -0,0 +1,33 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson writes UUID, datetime, date and time natively; everything else
+# (Decimal, lazy strings, timedelta, querysets) goes through DRF's encoder.
+# Non-str dict keys (e.g. the item index in ListField errors) are written as
+# strings, as json.dumps does.
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    Output matches JSONRenderer's compact form: UTC datetimes end in "Z",
+    Decimals not already coerced by a serializer become numbers, and
+    U+2028/U+2029 are escaped. ``orjson.Fragment`` values are embedded as is.
+    Any ``indent`` is rendered with orjson's two-space indentation.
+    """
+
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = _OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self.default, option=options)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,10 +1,29 @@
+import orjson
+from django.http import HttpResponse
 from rest_framework.response import Response
 
+from core.renderers import ORJSONRenderer
 
-def api_response(*, ok, message="", data=None, errors=None, status=200):
+
+def _envelope(ok, message, data, errors):
     payload = {"ok": ok, "message": message}
     if data is not None:
-        payload["data"] = data
+        payload["data"] = orjson.Fragment(data) if isinstance(data, bytes) else data
     if errors is not None:
         payload["errors"] = errors
-    return Response(payload, status=status)
+    return payload
+
+
+def api_response(*, ok, message="", data=None, errors=None, status=200):
+    """Wrap ``data`` in the API envelope.
+
+    ``data`` may be bytes holding already-serialized JSON; it is embedded in
+    the rendered body as is instead of being decoded and encoded again.
+    """
+    return Response(_envelope(ok, message, data, errors), status=status)
+
+
+def json_response(*, ok, message="", data=None, errors=None, status=200):
+    """api_response() for plain Django views (e.g. async ones), rendered right away."""
+    body = ORJSONRenderer().render(_envelope(ok, message, data, errors))
+    return HttpResponse(body, status=status, content_type=ORJSONRenderer.media_type)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -119,13 +120,72 @@ AUTH_USER_MODEL = "accounts.User"
 
 AUTHENTICATION_BACKENDS = [
     "accounts.backends.UsernameEmailPhoneBackend",
-    "django.contrib.auth.backends.ModelBackend",
 ]
 
+# The async login views hash passwords in a pool of this many threads; once
+# LOGIN_HASH_QUEUE more logins are waiting, further ones get a 503.
+LOGIN_HASH_WORKERS = min(4, os.cpu_count() or 1)
+LOGIN_HASH_QUEUE = 64
+# Login attempts allowed per (attempts, seconds) sliding window, counted
+# before any lookup; a successful login clears its identifier's count.
+LOGIN_THROTTLE_IDENTIFIER_RATE = (10, 15 * 60)
+LOGIN_THROTTLE_IP_RATE = (60, 60)
+# Trusted reverse proxies / load balancers in front of the app. The IP limit
+# then keys on the client address they append to X-Forwarded-For instead of
+# REMOTE_ADDR (which would be the proxy's, shared by every login).
+LOGIN_THROTTLE_NUM_PROXIES = 0
+# A CACHES alias to share counts between processes, or None for per-process
+# counters holding at most LOGIN_THROTTLE_MAX_KEYS keys.
+LOGIN_THROTTLE_CACHE = None
+LOGIN_THROTTLE_MAX_KEYS = 100_000
+# The owner and staff login APIs return JWTs; set this to False to skip the
+# session they also start, when no client relies on the session cookie.
+LOGIN_API_SESSIONS = True
+
+# Sessions (the worker portal, admin) live in a signed cookie rather than a
+# database row per login. Use "django.contrib.sessions.backends.cache" with a
+# shared CACHES backend instead if sessions must be revocable server-side.
+SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "core.exceptions.api_exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
+
+# Shifts
+
+SHIFT_LIST_PAGE_SIZE = 100
+SHIFT_LIST_MAX_PAGE_SIZE = 500
+SHIFT_EXPORT_CHUNK_SIZE = 2000
+SHIFT_BULK_MAX_ITEMS = 500
+SHIFT_AS_OF_MAX_DAYS = 93
+# The sync endpoint holds back rows modified this recently, so a slower
+# transaction cannot commit a row behind a cursor that was already handed out.
+SHIFT_SYNC_SETTLE_SECONDS = 30
+# "python" writes ShiftAudit rows from Shift.save() and the upsert paths;
+# "trigger" leaves it to the PostgreSQL trigger, which also covers QuerySet.update().
+SHIFT_AUDIT_BACKEND = "python"
+# ShiftAudit rows older than this are moved to gzip NDJSON files by
+# ``manage.py archive_shift_audits``; the history API reads them on request.
+SHIFT_AUDIT_RETENTION_DAYS = 90
+SHIFT_AUDIT_ARCHIVE_BATCH_SIZE = 5000
+SHIFT_AUDIT_ARCHIVE_DIR = BASE_DIR / "archive" / "shift_audit"
+# Payroll rules used by shifts.payroll.compute_hours().
+SHIFT_PAYROLL_ROUNDING_MINUTES = 15
+SHIFT_PAYROLL_DAILY_OVERTIME_HOURS = 8
+SHIFT_PAYROLL_WEEKLY_OVERTIME_HOURS = 48
+SHIFT_PAYROLL_TOLERANCE_MINUTES = 15
+SHIFT_IMPORT_CHUNK_SIZE = 5000
+SHIFT_IMPORT_MAX_ERRORS = 1000
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ShiftsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "shifts"
+
+    def ready(self):
+        from shifts.audit import sync_audit_trigger
+
+        post_migrate.connect(sync_audit_trigger, sender=self)
@@ -0,0 +1,228 @@
+import datetime
+import gzip
+import json
+import os
+import re
+import uuid
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from shifts.models import AUDITED_FIELDS, Shift, ShiftAudit, encode_audit_value
+from shifts.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+# One gzip NDJSON file per month of ``ShiftAudit.created``. Every archive batch
+# is appended as its own gzip member, which gzip readers concatenate. A text
+# index next to it lists "<shift id> <member offset>" for every shift in each
+# member, so a shift's history decompresses only the members holding it.
+ARCHIVE_FILE = re.compile(r"^shiftaudit_(\d{4})_(\d{2})\.ndjson\.gz$")
+ARCHIVE_FIELDS = ("id", "shift_id", "created", "modified", "attendance_date", "changed_fields", "diff")
+_READ_SIZE = 64 * 1024
+
+
+def archive_dir():
+    return Path(settings.SHIFT_AUDIT_ARCHIVE_DIR)
+
+
+def _month(instant):
+    return instant.astimezone(datetime.timezone.utc).date().replace(day=1)
+
+
+def archive_path(month):
+    return archive_dir() / f"shiftaudit_{month:%Y_%m}.ndjson.gz"
+
+
+def index_path(month):
+    return archive_dir() / f"shiftaudit_{month:%Y_%m}.idx"
+
+
+def archive_months():
+    """Return the months that have an archive file, oldest first."""
+    if not archive_dir().is_dir():
+        return []
+    months = []
+    for path in archive_dir().iterdir():
+        match = ARCHIVE_FILE.match(path.name)
+        if match:
+            months.append(datetime.date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def _to_record(row):
+    return {
+        "id": str(row["id"]),
+        "shift": str(row["shift_id"]),
+        "created": row["created"].isoformat(),
+        "modified": row["modified"].isoformat(),
+        "attendance_date": row["attendance_date"].isoformat(),
+        "changed_fields": row["changed_fields"],
+        "diff": row["diff"],
+    }
+
+
+def _read_member(raw, offset):
+    """Decompress the gzip member at ``offset``; return its data and where it ends."""
+    raw.seek(offset)
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    chunks = []
+    while not decompressor.eof:
+        chunk = raw.read(_READ_SIZE)
+        if not chunk:
+            raise EOFError(f"Truncated gzip member at offset {offset} of {raw.name}")
+        chunks.append(decompressor.decompress(chunk))
+    return b"".join(chunks), raw.tell() - len(decompressor.unused_data)
+
+
+def _index_lines(shift_ids, offset):
+    return "".join(f"{shift_id} {offset}\n" for shift_id in sorted(shift_ids))
+
+
+def _ensure_index(month):
+    """Build the index of an archive file written before indexes existed."""
+    if index_path(month).exists() or not archive_path(month).exists():
+        return
+    lines = []
+    with open(archive_path(month), "rb") as raw:
+        size = os.fstat(raw.fileno()).st_size
+        offset = 0
+        while offset < size:
+            data, end = _read_member(raw, offset)
+            lines.append(_index_lines({json.loads(line)["shift"] for line in data.splitlines()}, offset))
+            offset = end
+    partial = index_path(month).with_suffix(".idx.tmp")
+    with open(partial, "w") as index:
+        index.write("".join(lines))
+        index.flush()
+        os.fsync(index.fileno())
+    os.replace(partial, index_path(month))
+
+
+def _write(month, records):
+    archive_dir().mkdir(parents=True, exist_ok=True)
+    _ensure_index(month)
+    with open(archive_path(month), "ab") as raw:
+        offset = raw.tell()
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for record in records:
+                archive.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    # A crash before this line leaves an unindexed member whose rows are still
+    # in the table; the next run archives and indexes them again.
+    with open(index_path(month), "a") as index:
+        index.write(_index_lines({record["shift"] for record in records}, offset))
+        index.flush()
+        os.fsync(index.fileno())
+
+
+def archive_audits(before, *, batch_size):
+    """Move the audit rows created before ``before`` to the archive files.
+
+    Works oldest first in batches of ``batch_size``: each batch is appended and
+    fsynced before its rows are deleted, so a crash can at worst archive a
+    batch twice, never lose it. Yields the number of rows moved per batch.
+    """
+    while True:
+        rows = list(
+            ShiftAudit.objects.filter(created__lt=before)
+            .order_by("created", "id")
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(_month(row["created"]), []).append(_to_record(row))
+        for month, records in by_month.items():
+            _write(month, records)
+        with transaction.atomic():
+            ShiftAudit.objects.filter(id__in=[row["id"] for row in rows]).delete()
+        yield len(rows)
+
+
+def _read(month, shift_id):
+    shift_id = str(shift_id)
+    _ensure_index(month)
+    prefix = f"{shift_id} "
+    with open(index_path(month)) as index:
+        offsets = sorted({int(line[len(prefix) :]) for line in index if line.startswith(prefix)})
+    if not offsets:
+        return
+    with open(archive_path(month), "rb") as raw:
+        for offset in offsets:
+            data, _ = _read_member(raw, offset)
+            for line in data.splitlines():
+                record = json.loads(line)
+                if record["shift"] == shift_id:
+                    yield record
+
+
+def archived_history(shift, *, limit, cursor=None):
+    """Return up to ``limit`` archived history entries of ``shift``, newest first.
+
+    Entries have the shape of ``history_page()`` results and continue after
+    ``cursor`` with the same keyset, so paging can run from the hot table into
+    the archive. Only the members the monthly indexes list for the shift are
+    decompressed, from the shift's creation month onwards.
+    Returns ``(entries, next_cursor)``.
+    """
+    after = None
+    if cursor:
+        try:
+            created, audit_id = decode_cursor(cursor)
+            after = (datetime.datetime.fromisoformat(created), uuid.UUID(audit_id))
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Invalid cursor") from exc
+
+    # Months newer than the cursor are read too: their changes supply the
+    # ``to`` values of the older ones.
+    first_month = _month(shift.created)
+    records = {}
+    for month in archive_months():
+        if month < first_month:
+            continue
+        for record in _read(month, shift.id):
+            records[record["id"]] = record
+    audits = sorted(
+        (
+            (datetime.datetime.fromisoformat(record["created"]), uuid.UUID(record["id"]), record)
+            for record in records.values()
+        ),
+        key=lambda audit: audit[:2],
+        reverse=True,
+    )
+
+    # ``to`` of the newest archived change of a field is the old value in the
+    # oldest hot change of that field, or the current value.
+    following = {}
+    hot = ShiftAudit.objects.filter(shift_id=shift.id).order_by("-created", "-id").values_list("diff", flat=True)
+    for diff in hot:
+        following.update(diff)
+    current = Shift.objects.filter(pk=shift.id).values(*AUDITED_FIELDS).first() or {}
+
+    entries = []
+    next_cursor = None
+    for created, audit_id, record in audits:
+        changes = {}
+        for field, old in record["diff"].items():
+            new = following[field] if field in following else encode_audit_value(current.get(field))
+            changes[field] = {"from": old, "to": new}
+            following[field] = old
+        if after and (created, audit_id) >= after:
+            continue
+        if len(entries) == limit:
+            last = entries[-1]
+            next_cursor = encode_cursor([last["created"].isoformat(), str(last["id"])])
+            break
+        entries.append(
+            {
+                "id": audit_id,
+                "shift": uuid.UUID(record["shift"]),
+                "created": created,
+                "attendance_date": datetime.date.fromisoformat(record["attendance_date"]),
+                "changes": changes,
+            }
+        )
+    return entries, next_cursor
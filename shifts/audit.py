@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+AUDIT_TRIGGER = "shifts_shift_audit"
+
+
+def python_audit_enabled():
+    """Whether ShiftAudit rows are written by application code.
+
+    With ``SHIFT_AUDIT_BACKEND = "trigger"`` the statement-level trigger
+    installed by migration 0006 writes them instead, for every UPDATE path.
+    """
+    return settings.SHIFT_AUDIT_BACKEND != "trigger"
+
+
+def sync_audit_trigger(using=DEFAULT_DB_ALIAS, **kwargs):
+    """Enable or disable the audit trigger to match ``SHIFT_AUDIT_BACKEND``."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    from shifts.models import Shift
+
+    table = Shift._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_trigger WHERE tgname = %s AND tgrelid = %s::regclass",
+            [AUDIT_TRIGGER, table],
+        )
+        if cursor.fetchone() is None:
+            return
+        action = "DISABLE" if python_audit_enabled() else "ENABLE"
+        cursor.execute(
+            f"ALTER TABLE {connection.ops.quote_name(table)} {action} TRIGGER {connection.ops.quote_name(AUDIT_TRIGGER)}"
+        )
@@ -0,0 +1,50 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def _etag(request, *parts):
+    # The query string and renderer are part of the tag because fields,
+    # layout, cursor and page size all change the body for the same rows.
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (*parts, request.META.get("QUERY_STRING", ""), request.accepted_renderer.format):
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return quote_etag(digest.hexdigest())
+
+
+class Validators:
+    """ETag and Last-Modified of a shift response, computed before any serialization."""
+
+    def __init__(self, etag, modified):
+        self.etag = etag
+        self.modified = modified
+
+    @classmethod
+    def for_queryset(cls, request, queryset):
+        """Validators from the max ``modified`` and row count of the filtered queryset."""
+        state = queryset.order_by().aggregate(modified=Max("modified"), count=Count("id"))
+        return cls(_etag(request, state["modified"], state["count"]), state["modified"])
+
+    @classmethod
+    def for_row(cls, request, shift_id, modified):
+        return cls(_etag(request, shift_id, modified), modified)
+
+    @property
+    def last_modified(self):
+        return int(self.modified.timestamp()) if self.modified else None
+
+    def not_modified(self, request):
+        """Return a 304 (or 412) response if the request's preconditions say so, else None."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        if self.modified:
+            response["Last-Modified"] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,70 @@
+import csv
+import datetime
+import decimal
+import json
+import uuid
+
+from django.conf import settings
+
+EXPORT_FIELDS = (
+    "id",
+    "created",
+    "modified",
+    "attendance_date",
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+    "recorded_by_worker",
+    "recorded_by_staff",
+)
+
+
+def _to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime.datetime):
+        text = value.isoformat()
+        if text.endswith("+00:00"):
+            text = text[:-6] + "Z"
+        return text
+    if isinstance(value, (datetime.date, decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, fields=EXPORT_FIELDS):
+    """Yield export rows as tuples, reading through a server-side cursor."""
+    return queryset.values_list(*fields).iterator(chunk_size=settings.SHIFT_EXPORT_CHUNK_SIZE)
+
+
+def iter_ndjson(queryset, fields=EXPORT_FIELDS):
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for row in iter_rows(queryset, fields):
+        yield dumps(dict(zip(fields, map(_to_text, row)))) + "\n"
+
+
+def iter_ndjson_columns(queryset, fields=EXPORT_FIELDS):
+    """Like iter_ndjson(), but the first line lists the fields and each shift is an array."""
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    yield dumps(list(fields)) + "\n"
+    for row in iter_rows(queryset, fields):
+        yield dumps(list(map(_to_text, row))) + "\n"
+
+
+def iter_csv(queryset, fields=EXPORT_FIELDS):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in iter_rows(queryset, fields):
+        yield writer.writerow(map(_to_text, row))
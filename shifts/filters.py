@@ -0,0 +1,60 @@
+from rest_framework import serializers
+
+from shifts.export import EXPORT_FIELDS
+from shifts.models import Shift
+
+
+class ShiftFilterSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=Shift.Status.choices, required=False)
+    shift_type = serializers.ChoiceField(choices=Shift.ShiftType.choices, required=False)
+    absence_reason = serializers.ChoiceField(choices=Shift.AbsenceReason.choices, required=False)
+    recorded_by_worker = serializers.UUIDField(required=False)
+    recorded_by_staff = serializers.UUIDField(required=False)
+    company = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        return attrs
+
+    def filter_queryset(self, queryset):
+        params = self.validated_data
+        if "date_from" in params:
+            queryset = queryset.filter(attendance_date__gte=params["date_from"])
+        if "date_to" in params:
+            queryset = queryset.filter(attendance_date__lte=params["date_to"])
+        for field in ("status", "shift_type", "absence_reason"):
+            if field in params:
+                queryset = queryset.filter(**{field: params[field]})
+        if "recorded_by_worker" in params:
+            queryset = queryset.filter(recorded_by_worker_id=params["recorded_by_worker"])
+        if "recorded_by_staff" in params:
+            queryset = queryset.filter(recorded_by_staff_id=params["recorded_by_staff"])
+        if "company" in params:
+            queryset = queryset.for_company(params["company"])
+        return queryset
+
+
+LAYOUTS = ("records", "columnar")
+
+
+class ShiftFieldsSerializer(serializers.Serializer):
+    # ``fields`` is a comma-separated sparse fieldset; ``layout=columnar``
+    # sends column names once and each shift as a list of values.
+    fields = serializers.CharField(required=False)
+    layout = serializers.ChoiceField(choices=LAYOUTS, default="records")
+
+    def validate_fields(self, value):
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in EXPORT_FIELDS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(EXPORT_FIELDS)}."
+            )
+        if not names:
+            raise serializers.ValidationError("List at least one field.")
+        return names
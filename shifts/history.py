@@ -0,0 +1,75 @@
+import datetime
+import json
+import uuid
+
+from django.db import connections
+from django.db.models import Q
+
+from shifts.models import Shift, ShiftAudit
+from shifts.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _after(cursor):
+    try:
+        created, audit_id = decode_cursor(cursor)
+        created = datetime.datetime.fromisoformat(created)
+        audit_id = uuid.UUID(audit_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    return Q(created__lte=created) & (Q(created__lt=created) | Q(id__lt=audit_id))
+
+
+def history_page(audits, *, page_size, cursor=None):
+    """Return one newest-first page of ``audits`` with a from/to diff per entry.
+
+    ``to`` values come from the next change of the same field, found with LAG()
+    over the audit rows, or from the current shift when nothing changed it
+    later. Values are text, as stored in ``ShiftAudit.diff``.
+    """
+    audits = audits.order_by("-created", "-id")
+    if cursor:
+        audits = audits.filter(_after(cursor))
+    page = audits.values("id", "shift_id", "created", "attendance_date")[: page_size + 1]
+    page_sql, page_params = page.query.sql_with_params()
+
+    connection = connections[audits.db]
+    audit_table = connection.ops.quote_name(ShiftAudit._meta.db_table)
+    shift_table = connection.ops.quote_name(Shift._meta.db_table)
+    sql = (
+        f"WITH page AS ({page_sql}), "
+        f"steps AS ("
+        f"SELECT a.id AS audit_id, c.key, c.value AS old, "
+        f"lag(a.id) OVER later AS next_audit_id, lag(c.value) OVER later AS next_old "
+        f"FROM {audit_table} a CROSS JOIN LATERAL jsonb_each_text(a.diff) AS c(key, value) "
+        f"WHERE a.shift_id IN (SELECT shift_id FROM page) AND a.created >= (SELECT min(created) FROM page) "
+        f"WINDOW later AS (PARTITION BY a.shift_id, c.key ORDER BY a.created DESC, a.id DESC)"
+        f"), diffs AS ("
+        f"SELECT st.audit_id, jsonb_object_agg(st.key, jsonb_build_object("
+        f"'from', st.old, "
+        f"'to', CASE WHEN st.next_audit_id IS NULL THEN to_jsonb(s) ->> st.key ELSE st.next_old END"
+        f")) AS changes "
+        f"FROM steps st JOIN page p ON p.id = st.audit_id JOIN {shift_table} s ON s.id = p.shift_id "
+        f"GROUP BY st.audit_id"
+        f") SELECT p.id, p.shift_id, p.created, p.attendance_date, COALESCE(d.changes, '{{}}'::jsonb) "
+        f"FROM page p LEFT JOIN diffs d ON d.audit_id = p.id "
+        f"ORDER BY p.created DESC, p.id DESC"
+    )
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(sql, page_params)
+        rows = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([rows[-1][2].isoformat(), str(rows[-1][0])])
+    entries = [
+        {
+            "id": audit_id,
+            "shift": shift_id,
+            "created": created,
+            "attendance_date": attendance_date,
+            "changes": json.loads(changes) if isinstance(changes, str) else changes,
+        }
+        for audit_id, shift_id, created, attendance_date, changes in rows
+    ]
+    return entries, next_cursor
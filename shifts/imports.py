@@ -0,0 +1,230 @@
+import csv
+import datetime
+import io
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models.staff import Staff
+from accounts.models.worker import Worker
+from shifts.audit import python_audit_enabled
+from shifts.models import AUDITED_FIELDS, Shift
+from shifts.upsert import UPSERT_FIELDS, _audit_sql, _column, _table
+
+IMPORT_FORMATS = ("csv", "xlsx")
+# Spreadsheet columns; recorders are given by id or employee code.
+IMPORT_COLUMNS = ("attendance_date", *UPSERT_FIELDS, "recorded_by_worker", "recorded_by_staff")
+STAGING_TABLE = "shift_import"
+STAGING_FIELDS = ("id", "created", "modified", *IMPORT_COLUMNS)
+RECORDERS = {
+    "recorded_by_worker": Worker,
+    "recorded_by_staff": Staff,
+}
+
+
+def iter_csv_rows(file):
+    """Yield ``(line_number, dict)`` from a binary CSV file with a header row."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(file):
+    """Yield ``(row_number, dict)`` from the first sheet of an XLSX file, read in streaming mode."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(file, file_format):
+    if file_format == "xlsx":
+        return iter_xlsx_rows(file)
+    return iter_csv_rows(file)
+
+
+def _recorder_index(model, company_id):
+    index = {}
+    for recorder_id, code in model.objects.filter(company_id=company_id).values_list("id", "employee_code"):
+        index[str(recorder_id)] = recorder_id
+        if code:
+            index.setdefault(code, recorder_id)
+    return index
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _to_copy(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+class ShiftImport:
+    """Validate spreadsheet rows like ``Shift.full_clean()`` and merge them with COPY.
+
+    Valid rows are streamed into a temporary staging table in chunks of
+    ``SHIFT_IMPORT_CHUNK_SIZE`` and merged into ``shifts_shift`` with one
+    INSERT .. ON CONFLICT per recorder kind, so each partial unique constraint
+    is its own arbiter. Existing rows for the same recorder and date are
+    overwritten and audited. Invalid rows are skipped and reported by number.
+    """
+
+    def __init__(self, company_id, *, dry_run=False):
+        self.company_id = company_id
+        self.dry_run = dry_run
+        self.recorders = {name: _recorder_index(model, company_id) for name, model in RECORDERS.items()}
+        self.rows = 0
+        self.errors = []
+        self.error_count = 0
+        self.inserted = 0
+        self.updated = 0
+        self._seen = set()
+        self._buffer = []
+        self._now = timezone.now()
+
+    def report(self):
+        return {
+            "rows": self.rows,
+            "valid": self.rows - self.error_count,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "dry_run": self.dry_run,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+    def _error(self, number, errors):
+        self.error_count += 1
+        if len(self.errors) < settings.SHIFT_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": number, "errors": errors})
+
+    def _build(self, row):
+        shift = Shift(id=uuid.uuid4(), created=self._now, modified=self._now)
+        errors = {}
+        for name in IMPORT_COLUMNS:
+            value = row.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if _blank(value):
+                value = None
+            if name in RECORDERS:
+                if value is not None:
+                    recorder_id = self.recorders[name].get(str(value))
+                    if recorder_id is None:
+                        errors[name] = ["Unknown for this company."]
+                    setattr(shift, f"{name}_id", recorder_id)
+            else:
+                setattr(shift, name, "" if value is None and not Shift._meta.get_field(name).null else value)
+        try:
+            # Uniqueness is settled by the merge, and recorders were resolved above.
+            shift.full_clean(exclude=list(RECORDERS), validate_unique=False, validate_constraints=False)
+        except ValidationError as exc:
+            for field, messages in exc.message_dict.items():
+                errors.setdefault(field, []).extend(messages)
+        if errors:
+            raise ValidationError(errors)
+        return shift
+
+    def feed(self, rows):
+        """Validate ``(number, dict)`` rows, staging the valid ones."""
+        for number, row in rows:
+            self.rows += 1
+            try:
+                shift = self._build(row)
+            except ValidationError as exc:
+                self._error(number, exc.message_dict)
+                continue
+            key = (shift.recorded_by_worker_id, shift.recorded_by_staff_id, shift.attendance_date)
+            if key in self._seen:
+                self._error(number, {"attendance_date": ["Duplicate recorder and date in file."]})
+                continue
+            self._seen.add(key)
+            if self.dry_run:
+                continue
+            self._buffer.append(shift)
+            if len(self._buffer) >= settings.SHIFT_IMPORT_CHUNK_SIZE:
+                self._copy()
+
+    def _copy(self):
+        data = io.StringIO()
+        writer = csv.writer(data)
+        fields = [Shift._meta.get_field(name) for name in STAGING_FIELDS]
+        for shift in self._buffer:
+            writer.writerow([_to_copy(getattr(shift, field.attname)) for field in fields])
+        data.seek(0)
+        columns = ", ".join(_column(name) for name in STAGING_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", data)
+        self._buffer = []
+
+    def run(self, rows):
+        """Import ``rows`` in one transaction and return the report."""
+        with transaction.atomic():
+            if not self.dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TEMPORARY TABLE {STAGING_TABLE} (LIKE {_table(Shift)} INCLUDING DEFAULTS) "
+                        f"ON COMMIT DROP"
+                    )
+            self.feed(rows)
+            if not self.dry_run:
+                if self._buffer:
+                    self._copy()
+                for recorder in RECORDERS:
+                    self._merge(recorder)
+        return self.report()
+
+    def _merge(self, recorder):
+        recorder_column = _column(recorder)
+        date_column = _column("attendance_date")
+        columns = ", ".join(_column(name) for name in STAGING_FIELDS)
+        matches = (
+            f"FROM {_table(Shift)} s JOIN {STAGING_TABLE} i "
+            f"ON s.{recorder_column} = i.{recorder_column} AND s.{date_column} = i.{date_column}"
+        )
+        updates = ", ".join(f"{_column(name)} = EXCLUDED.{_column(name)}" for name in UPSERT_FIELDS + ("modified",))
+        returning = ", ".join(_column(name) for name in ("id", *AUDITED_FIELDS))
+        with connection.cursor() as cursor:
+            # Lock the rows about to be overwritten first, so the merge below
+            # reads their old values for the audit under that lock.
+            cursor.execute(f"SELECT 1 {matches} FOR UPDATE OF s")
+            sql = (
+                f"WITH old AS (SELECT s.{_column('id')}, "
+                f"{', '.join('s.' + _column(name) for name in AUDITED_FIELDS)} {matches}), "
+                f"up AS (INSERT INTO {_table(Shift)} ({columns}) "
+                f"SELECT {columns} FROM {STAGING_TABLE} WHERE {recorder_column} IS NOT NULL "
+                f"ON CONFLICT ({recorder_column}, {date_column}) WHERE {recorder_column} IS NOT NULL "
+                f"DO UPDATE SET {updates} "
+                f"RETURNING {returning}, (xmax = 0) AS inserted)"
+            )
+            if python_audit_enabled():
+                sql += f", audit AS ({_audit_sql(('gen_random_uuid()', 'now()', 'now()'))})"
+            sql += " SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM up"
+            cursor.execute(sql)
+            inserted, updated = cursor.fetchone()
+        self.inserted += inserted
+        self.updated += updated
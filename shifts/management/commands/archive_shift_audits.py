@@ -0,0 +1,43 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from shifts.archive import archive_audits, archive_dir
+
+
+class Command(BaseCommand):
+    help = "Move old ShiftAudit rows to gzip NDJSON archive files and delete them. Run daily from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.SHIFT_AUDIT_RETENTION_DAYS,
+            metavar="DAYS",
+            help="Archive audit rows created more than DAYS ago (default and minimum: SHIFT_AUDIT_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SHIFT_AUDIT_ARCHIVE_BATCH_SIZE,
+            help="Rows written and deleted per batch (default: SHIFT_AUDIT_ARCHIVE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than"] < settings.SHIFT_AUDIT_RETENTION_DAYS:
+            # The as-of endpoints accept instants back to the retention window
+            # and read only hot audit rows.
+            raise CommandError(
+                f"--older-than must be at least SHIFT_AUDIT_RETENTION_DAYS ({settings.SHIFT_AUDIT_RETENTION_DAYS})."
+            )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        before = timezone.now() - datetime.timedelta(days=options["older_than"])
+        total = 0
+        for count in archive_audits(before, batch_size=options["batch_size"]):
+            total += count
+            self.stdout.write(f"Archived {total} rows")
+        self.stdout.write(f"Archived {total} audit rows created before {before:%Y-%m-%d} to {archive_dir()}")
@@ -0,0 +1,89 @@
+import datetime
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from shifts.models import Shift
+from shifts.payroll import TIME_PAIRS, ShiftArrays, compute_hours, payroll_for_range, payroll_totals
+
+
+def synthetic_shifts(workers, days, seed=0):
+    """One shift per worker per day with realistic noise, for benchmarking without a database."""
+    rng = np.random.default_rng(seed)
+    count = workers * days
+    recorder = np.repeat(np.arange(workers, dtype=np.int64), days)
+    day = np.tile(np.arange(days, dtype=np.int64), workers) + 20089  # 2025-01-01
+    night = rng.random(count) < 0.3
+    absent = rng.random(count) < 0.05
+    start = day * 86400.0 + np.where(night, 20 * 3600.0, 7 * 3600.0) + rng.normal(0, 600, count)
+    end = start + rng.normal(9 * 3600.0, 1800, count)
+    times = {}
+    for (start_name, end_name), noise in zip(TIME_PAIRS, (300, 900, 0)):
+        times[start_name] = start + rng.normal(0, noise, count)
+        times[end_name] = end + rng.normal(0, noise, count)
+        # Some shifts miss a source entirely, so every fallback gets exercised.
+        missing = rng.random(count) < 0.2
+        times[start_name][missing] = np.nan
+        times[end_name][missing] = np.nan
+    # Night shifts typed with both times on the attendance date.
+    wrapped = night & (rng.random(count) < 0.1)
+    times["staff_end_date_time"][wrapped] -= 86400.0
+    return ShiftArrays(
+        ids=list(range(count)),
+        recorders=[("worker", index) for index in range(workers)],
+        recorder=recorder,
+        day=day,
+        night=night,
+        absent=absent,
+        manual_hours=np.where(rng.random(count) < 0.5, 8.0, np.nan),
+        times=times,
+    )
+
+
+class Command(BaseCommand):
+    help = "Benchmark the vectorised payroll engine on synthetic shifts or a date range from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=10000)
+        parser.add_argument("--days", type=int, default=31)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--date-from",
+            type=datetime.date.fromisoformat,
+            help="Benchmark loading and computing real shifts from this date (requires --date-to).",
+        )
+        parser.add_argument("--date-to", type=datetime.date.fromisoformat)
+
+    def handle(self, *args, **options):
+        if (options["date_from"] is None) != (options["date_to"] is None):
+            raise CommandError("--date-from and --date-to go together.")
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+
+        if options["date_from"]:
+            self._time(
+                "load + compute",
+                options["repeat"],
+                lambda: payroll_for_range(Shift.objects.all(), options["date_from"], options["date_to"]),
+            )
+            return
+
+        shifts = synthetic_shifts(options["workers"], options["days"])
+        self.stdout.write(f"{len(shifts)} synthetic shifts ({options['workers']} workers x {options['days']} days)")
+        result = self._time("compute_hours", options["repeat"], lambda: compute_hours(shifts))
+        self._time("payroll_totals", options["repeat"], lambda: payroll_totals(shifts, result))
+        self.stdout.write(
+            f"total {result['hours'].sum():.0f} h, overtime {result['overtime'].sum():.0f} h, "
+            f"{int(result['discrepancy'].sum())} discrepancies"
+        )
+
+    def _time(self, label, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            value = func()
+            timings.append(time.perf_counter() - started)
+        median = sorted(timings)[repeat // 2]
+        self.stdout.write(f"{label}: best {min(timings) * 1000:.1f} ms, median {median * 1000:.1f} ms")
+        return value
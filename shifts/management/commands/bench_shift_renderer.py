@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from shifts.management.commands.bench_shift_serializer import synthetic_shifts
+from shifts.views.staff.shift import SHIFT_ROWS
+
+
+def _percentile(timings, fraction):
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Compare p50/p99 render times of a shift list page with DRF's JSONRenderer and ORJSONRenderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            type=int,
+            nargs="+",
+            default=[settings.SHIFT_LIST_PAGE_SIZE, settings.SHIFT_LIST_MAX_PAGE_SIZE],
+        )
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+        for page_size in options["page_sizes"]:
+            shifts = synthetic_shifts(page_size)
+            rows = [tuple(getattr(shift, field) for field in SHIFT_ROWS.fields) for shift in shifts]
+            payload = {
+                "ok": True,
+                "message": "Shift list",
+                "data": {"results": SHIFT_ROWS.to_representation(rows), "next_cursor": None},
+            }
+            bodies = []
+            for renderer in (JSONRenderer(), ORJSONRenderer()):
+                timings = []
+                for _ in range(options["requests"]):
+                    started = time.perf_counter()
+                    body = renderer.render(payload)
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                bodies.append(body)
+                self.stdout.write(
+                    f"{page_size:>5} rows {type(renderer).__name__:>15}: "
+                    f"p50 {_percentile(timings, 0.5) * 1000:7.3f} ms, p99 {_percentile(timings, 0.99) * 1000:7.3f} ms"
+                )
+            if bodies[0] != bodies[1]:
+                raise CommandError(f"Output differs at {page_size} rows.")
@@ -0,0 +1,85 @@
+import datetime
+import decimal
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from shifts.models import Shift
+from shifts.views.staff.shift import SHIFT_ROWS, ShiftSerializer
+
+
+def synthetic_shifts(count, seed=0):
+    """Unsaved shifts with every column filled the way the database returns them."""
+    rng = random.Random(seed)
+    base = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    recorders = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(200)]
+    shifts = []
+    for index in range(count):
+        start = base + datetime.timedelta(
+            days=index % 365, hours=rng.choice((7, 19)), microseconds=rng.randrange(10**6)
+        )
+        end = start + datetime.timedelta(hours=9, minutes=rng.randrange(60))
+        absent = rng.random() < 0.1
+        shifts.append(
+            Shift(
+                id=uuid.UUID(int=rng.getrandbits(128)),
+                created=start,
+                modified=end,
+                attendance_date=start.date(),
+                shift_type=rng.choice(Shift.ShiftType.values),
+                status=Shift.Status.ABSENT if absent else Shift.Status.PRESENT,
+                absence_reason=rng.choice(Shift.AbsenceReason.values) if absent else None,
+                hours=None if absent else decimal.Decimal(rng.randrange(400, 1200)).scaleb(-2),
+                start_date_time=start,
+                end_date_time=end,
+                worker_start_date_time=start if rng.random() < 0.5 else None,
+                worker_end_date_time=end if rng.random() < 0.5 else None,
+                staff_start_date_time=start,
+                staff_end_date_time=end,
+                recorded_by_worker_id=rng.choice(recorders) if index % 2 else None,
+                recorded_by_staff_id=None if index % 2 else rng.choice(recorders),
+            )
+        )
+    return shifts
+
+
+class Command(BaseCommand):
+    help = "Compare ShiftSerializer with the values_list() row serializer and check both render the same JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        renderer = JSONRenderer()
+        for size in options["sizes"]:
+            shifts = synthetic_shifts(size)
+            rows = [tuple(getattr(shift, field) for field in SHIFT_ROWS.fields) for shift in shifts]
+
+            slow, slow_body = self._time(
+                options["repeat"], lambda: renderer.render(ShiftSerializer(shifts, many=True).data)
+            )
+            fast, fast_body = self._time(
+                options["repeat"], lambda: renderer.render(SHIFT_ROWS.to_representation(rows))
+            )
+            if slow_body != fast_body:
+                raise CommandError(f"Output differs at {size} rows.")
+            self.stdout.write(
+                f"{size:>7} rows: ShiftSerializer {slow * 1000:9.1f} ms, rows {fast * 1000:8.1f} ms "
+                f"({slow / fast:.1f}x), {len(fast_body)} identical bytes"
+            )
+
+    @staticmethod
+    def _time(repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            value = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, value
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.models.company import Company
+from shifts.imports import IMPORT_FORMATS, ShiftImport, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Import shifts for a company from a CSV or XLSX file, merging by recorder and date."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--company", required=True, help="Company id the recorders belong to.")
+        parser.add_argument(
+            "--file-format",
+            choices=IMPORT_FORMATS,
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; write nothing.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Shift import requires PostgreSQL.")
+        path = Path(options["path"])
+        file_format = options["file_format"] or path.suffix.lstrip(".").lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Unsupported file format {file_format!r}; use --file-format.")
+        company = Company.objects.filter(pk=options["company"]).first()
+        if company is None:
+            raise CommandError("Company not found.")
+
+        with path.open("rb") as file:
+            report = ShiftImport(company.pk, dry_run=options["dry_run"]).run(iter_rows(file, file_format))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report["error_count"] > len(report["errors"]):
+            self.stderr.write(f"... {report['error_count'] - len(report['errors'])} more rows with errors")
+        self.stdout.write(
+            f"{report['rows']} rows read, {report['valid']} valid, "
+            f"{report['inserted']} inserted, {report['updated']} updated"
+            + (" (dry run)" if report["dry_run"] else "")
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from shifts.summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly shift summaries from the shifts table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if connections[options["database"]].vendor != "postgresql":
+            raise CommandError("Shift summaries require PostgreSQL.")
+        written = rebuild_summaries(using=options["database"])
+        self.stdout.write(f"Rebuilt {written} shift summary rows")
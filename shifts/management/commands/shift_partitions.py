@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from shifts.partitions import add_months, create_partitions, detach_partitions, month_start
+
+
+class Command(BaseCommand):
+    help = "Pre-create future monthly Shift/ShiftAudit partitions and detach old ones. Run daily from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="Number of months after the current one to create partitions for (default: 3).",
+        )
+        parser.add_argument(
+            "--detach-older-than",
+            type=int,
+            metavar="MONTHS",
+            help="Detach partitions for months more than MONTHS before the current one.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning requires PostgreSQL.")
+        if options["ahead"] < 0:
+            raise CommandError("--ahead must not be negative.")
+
+        this_month = month_start(timezone.localdate())
+        failed = False
+        for name, error in create_partitions(connection, this_month, add_months(this_month, options["ahead"])):
+            if error is None:
+                self.stdout.write(f"Created {name}")
+            else:
+                failed = True
+                self.stderr.write(f"Could not create {name}: {error}")
+
+        months = options["detach_older_than"]
+        if months is not None:
+            if months < 1:
+                raise CommandError("--detach-older-than must be at least 1.")
+            for name in detach_partitions(connection, add_months(this_month, -months)):
+                self.stdout.write(f"Detached {name}")
+
+        if failed:
+            raise CommandError("Some partitions could not be created.")
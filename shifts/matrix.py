@@ -0,0 +1,108 @@
+import calendar
+import csv
+import datetime
+import io
+
+from shifts.models import Shift
+
+# Cell codes of the attendance matrix; a cell holds the index into this tuple.
+LEGEND = (
+    ("", "No record"),
+    ("P", "Present"),
+    ("A", "Absent"),
+    ("SK", Shift.AbsenceReason.SICK.label),
+    ("SO", Shift.AbsenceReason.SITE_OUT.label),
+    ("NW", Shift.AbsenceReason.NO_WORK.label),
+    ("SF", Shift.AbsenceReason.SAFETY.label),
+    ("TR", Shift.AbsenceReason.TRAINING.label),
+)
+CELL_CODES = {
+    (Shift.Status.PRESENT, None): 1,
+    (Shift.Status.ABSENT, None): 2,
+    **{(Shift.Status.ABSENT, reason): index for index, reason in enumerate(Shift.AbsenceReason.values, start=3)},
+}
+MATRIX_FIELDS = (
+    "recorded_by_worker_id",
+    "recorded_by_staff_id",
+    "attendance_date",
+    "status",
+    "absence_reason",
+    "hours",
+    "recorded_by_worker__employee_code",
+    "recorded_by_worker__user__first_name",
+    "recorded_by_worker__user__last_name",
+    "recorded_by_worker__user__username",
+    "recorded_by_staff__employee_code",
+    "recorded_by_staff__user__first_name",
+    "recorded_by_staff__user__last_name",
+    "recorded_by_staff__user__username",
+)
+
+
+def _label(kind, recorder_id, code, first_name, last_name, username):
+    name = f"{first_name or ''} {last_name or ''}".strip() or username or code or kind.title()
+    return {"kind": kind, "id": recorder_id, "name": name, "employee_code": code or ""}
+
+
+def build_matrix(shifts, month):
+    """Pivot ``shifts`` of ``month`` into a recorders x days grid.
+
+    Reads the month with one query, names included, and returns row labels,
+    the legend and two row-major flat lists of ``len(rows) * days`` cells:
+    ``codes`` (indexes into the legend) and ``hours`` (float or None).
+    """
+    days = calendar.monthrange(month.year, month.month)[1]
+    rows = shifts.order_by().filter(attendance_date__range=(month, month + datetime.timedelta(days=days - 1)))
+
+    labels = {}
+    cells = []
+    for worker_id, staff_id, attendance_date, status, reason, hours, *names in rows.values_list(*MATRIX_FIELDS):
+        if worker_id:
+            key = ("worker", worker_id)
+            if key not in labels:
+                labels[key] = _label("worker", worker_id, *names[:4])
+        else:
+            key = ("staff", staff_id)
+            if key not in labels:
+                labels[key] = _label("staff", staff_id, *names[4:])
+        code = CELL_CODES.get((status, reason), CELL_CODES.get((status, None), 0))
+        cells.append((key, attendance_date.day - 1, code, hours))
+
+    order = sorted(labels, key=lambda key: (key[0] != "worker", labels[key]["name"].lower(), str(key[1])))
+    position = {key: index for index, key in enumerate(order)}
+    codes = [0] * (len(order) * days)
+    hours_grid = [None] * (len(order) * days)
+    for key, day, code, hours in cells:
+        cell = position[key] * days + day
+        codes[cell] = code
+        hours_grid[cell] = None if hours is None else float(hours)
+
+    return {
+        "month": f"{month:%Y-%m}",
+        "days": days,
+        "rows": [labels[key] for key in order],
+        "legend": [{"code": code, "label": label} for code, label in LEGEND],
+        "codes": codes,
+        "hours": hours_grid,
+    }
+
+
+def matrix_csv(matrix):
+    """Render ``build_matrix()`` output as CSV, one line per recorder."""
+    days = matrix["days"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["name", "employee_code", *range(1, days + 1), "total_hours"])
+    for index, row in enumerate(matrix["rows"]):
+        start = index * days
+        line = [row["name"], row["employee_code"]]
+        total = 0.0
+        for code, hours in zip(matrix["codes"][start : start + days], matrix["hours"][start : start + days]):
+            cell = LEGEND[code][0]
+            if hours is not None:
+                cell = f"{cell} {hours:g}".strip()
+                total += hours
+            line.append(cell)
+        line.append(f"{total:g}")
+        writer.writerow(line)
+    return buffer.getvalue()
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0003_shift_absence_reason"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(fields=["attendance_date", "id"], name="shift_date_id_idx"),
+        ),
+    ]
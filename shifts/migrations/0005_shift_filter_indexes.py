@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0004_shift_date_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(fields=["status", "attendance_date"], name="shift_status_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(fields=["shift_type", "attendance_date"], name="shift_type_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(
+                condition=models.Q(("absence_reason__isnull", False)),
+                fields=["absence_reason", "attendance_date"],
+                name="shift_reason_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+AUDITED_COLUMNS = [
+    "attendance_date",
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+]
+SNAPSHOT_COLUMNS = AUDITED_COLUMNS + ["recorded_by_worker_id", "recorded_by_staff_id"]
+
+
+def _columns(prefix, columns):
+    return ", ".join(f"{prefix}.{column}" for column in columns)
+
+
+# Statement-level so bulk UPDATEs write their audit rows in one INSERT. The
+# trigger is created disabled; shifts.audit.sync_audit_trigger enables it after
+# migrate when SHIFT_AUDIT_BACKEND = "trigger".
+CREATE_TRIGGER = f"""
+CREATE FUNCTION shifts_shift_audit() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO shifts_shiftaudit (id, created, modified, shift_id, {", ".join(SNAPSHOT_COLUMNS)})
+    SELECT gen_random_uuid(), clock_timestamp(), clock_timestamp(), o.id, {_columns("o", SNAPSHOT_COLUMNS)}
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    WHERE ({_columns("o", AUDITED_COLUMNS)}) IS DISTINCT FROM ({_columns("n", AUDITED_COLUMNS)});
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER shifts_shift_audit
+AFTER UPDATE ON shifts_shift
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION shifts_shift_audit();
+
+ALTER TABLE shifts_shift DISABLE TRIGGER shifts_shift_audit;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS shifts_shift_audit ON shifts_shift;
+DROP FUNCTION IF EXISTS shifts_shift_audit();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0005_shift_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
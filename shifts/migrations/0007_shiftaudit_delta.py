@@ -0,0 +1,189 @@
+import datetime
+
+from django.db import migrations, models
+
+# Frozen copy of shifts.models.AUDITED_FIELDS; position is the changed_fields bit.
+AUDITED_FIELDS = [
+    "attendance_date",
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+    "recorded_by_worker_id",
+    "recorded_by_staff_id",
+]
+# The fields whose change triggered an audit row before this migration.
+DATA_FIELDS = AUDITED_FIELDS[:11]
+FULL_ROW_FIELDS = [
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+    "recorded_by_worker",
+    "recorded_by_staff",
+]
+BATCH_SIZE = 1000
+
+
+def _encode(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _audited_shifts(ShiftAudit):
+    return ShiftAudit.objects.order_by().values_list("shift_id", flat=True).distinct().iterator()
+
+
+def to_delta(apps, schema_editor):
+    """Replace each full audit row by the fields that differ from the next version."""
+    Shift = apps.get_model("shifts", "Shift")
+    ShiftAudit = apps.get_model("shifts", "ShiftAudit")
+    pending = []
+    for shift_id in _audited_shifts(ShiftAudit):
+        following = Shift.objects.filter(pk=shift_id).values(*AUDITED_FIELDS).get()
+        for audit in ShiftAudit.objects.filter(shift_id=shift_id).order_by("-created", "-id"):
+            previous = {field: getattr(audit, field) for field in AUDITED_FIELDS}
+            audit.diff = {}
+            audit.changed_fields = 0
+            for bit, field in enumerate(AUDITED_FIELDS):
+                if previous[field] != following[field]:
+                    audit.diff[field] = _encode(previous[field])
+                    audit.changed_fields |= 1 << bit
+            following = previous
+            pending.append(audit)
+        if len(pending) >= BATCH_SIZE:
+            ShiftAudit.objects.bulk_update(pending, ["diff", "changed_fields"])
+            pending = []
+    ShiftAudit.objects.bulk_update(pending, ["diff", "changed_fields"])
+
+
+def to_full(apps, schema_editor):
+    """Rebuild the full previous row of every audit from the deltas."""
+    Shift = apps.get_model("shifts", "Shift")
+    ShiftAudit = apps.get_model("shifts", "ShiftAudit")
+    pending = []
+    for shift_id in _audited_shifts(ShiftAudit):
+        state = Shift.objects.filter(pk=shift_id).values(*AUDITED_FIELDS).get()
+        for audit in ShiftAudit.objects.filter(shift_id=shift_id).order_by("-created", "-id"):
+            for field, value in audit.diff.items():
+                state[field] = None if value is None else Shift._meta.get_field(field).to_python(value)
+            for field in AUDITED_FIELDS:
+                setattr(audit, field, state[field])
+            pending.append(audit)
+        if len(pending) >= BATCH_SIZE:
+            ShiftAudit.objects.bulk_update(pending, FULL_ROW_FIELDS)
+            pending = []
+    ShiftAudit.objects.bulk_update(pending, FULL_ROW_FIELDS)
+    # Flush the deferred FK checks queued by the updates before the
+    # surrounding ALTER TABLE statements run in the same transaction.
+    schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    schema_editor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+
+def _changes(old, new):
+    rows = []
+    for bit, column in enumerate(AUDITED_FIELDS):
+        value = f"{old}.{column}::text" if column == "hours" else f"{old}.{column}"
+        rows.append(f"('{column}', {1 << bit}, to_jsonb({value}), {old}.{column} IS DISTINCT FROM {new}.{column})")
+    return ",\n            ".join(rows)
+
+
+DELTA_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION shifts_shift_audit() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO shifts_shiftaudit (id, created, modified, shift_id, attendance_date, changed_fields, diff)
+    SELECT gen_random_uuid(), clock_timestamp(), clock_timestamp(), o.id, o.attendance_date, delta.mask, delta.diff
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    CROSS JOIN LATERAL (
+        SELECT sum(c.bit)::integer AS mask, jsonb_object_agg(c.name, c.value) AS diff
+        FROM (VALUES
+            {_changes("o", "n")}
+        ) AS c(name, bit, value, changed)
+        WHERE c.changed
+    ) AS delta
+    WHERE delta.mask IS NOT NULL;
+    RETURN NULL;
+END;
+$$;
+"""
+
+FULL_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION shifts_shift_audit() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO shifts_shiftaudit (id, created, modified, shift_id, {", ".join(AUDITED_FIELDS)})
+    SELECT gen_random_uuid(), clock_timestamp(), clock_timestamp(), o.id, {", ".join("o." + c for c in AUDITED_FIELDS)}
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    WHERE ({", ".join("o." + c for c in DATA_FIELDS)})
+        IS DISTINCT FROM ({", ".join("n." + c for c in DATA_FIELDS)});
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0006_shift_audit_trigger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shiftaudit",
+            name="changed_fields",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="shiftaudit",
+            name="diff",
+            field=models.JSONField(default=dict),
+        ),
+        # Nullable first so that rolling back can re-add and refill the columns.
+        migrations.AlterField(
+            model_name="shiftaudit",
+            name="shift_type",
+            field=models.CharField(blank=True, choices=[("day", "Day"), ("night", "Night")], max_length=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name="shiftaudit",
+            name="status",
+            field=models.CharField(
+                blank=True,
+                choices=[("present", "Present"), ("absent", "Absent")],
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(to_delta, to_full),
+        migrations.RunSQL(DELTA_FUNCTION, FULL_FUNCTION),
+        migrations.RemoveField(model_name="shiftaudit", name="absence_reason"),
+        migrations.RemoveField(model_name="shiftaudit", name="end_date_time"),
+        migrations.RemoveField(model_name="shiftaudit", name="hours"),
+        migrations.RemoveField(model_name="shiftaudit", name="recorded_by_staff"),
+        migrations.RemoveField(model_name="shiftaudit", name="recorded_by_worker"),
+        migrations.RemoveField(model_name="shiftaudit", name="shift_type"),
+        migrations.RemoveField(model_name="shiftaudit", name="staff_end_date_time"),
+        migrations.RemoveField(model_name="shiftaudit", name="staff_start_date_time"),
+        migrations.RemoveField(model_name="shiftaudit", name="start_date_time"),
+        migrations.RemoveField(model_name="shiftaudit", name="status"),
+        migrations.RemoveField(model_name="shiftaudit", name="worker_end_date_time"),
+        migrations.RemoveField(model_name="shiftaudit", name="worker_start_date_time"),
+    ]
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0007_shiftaudit_delta"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shiftaudit",
+            index=models.Index(fields=["shift", "created"], name="shiftaudit_shift_created_idx"),
+        ),
+        migrations.AlterField(
+            model_name="shiftaudit",
+            name="shift",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="changes",
+                to="shifts.shift",
+            ),
+        ),
+    ]
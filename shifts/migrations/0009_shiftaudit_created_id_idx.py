@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shifts", "0008_shiftaudit_shift_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shiftaudit",
+            index=models.Index(fields=["created", "id"], name="shiftaudit_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,131 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Creates one partition per month from the oldest row up to three months ahead,
+# plus a DEFAULT partition. Later months come from ``manage.py shift_partitions``.
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    tbl text;
+    first_month date;
+    month date;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY['shifts_shift', 'shifts_shiftaudit'] LOOP
+        EXECUTE format('SELECT min(attendance_date) FROM %I', tbl || '_unpartitioned') INTO first_month;
+        first_month := date_trunc('month', COALESCE(first_month, current_date))::date;
+        month := first_month;
+        WHILE month <= date_trunc('month', current_date + interval '3 months')::date LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                tbl || '_p' || to_char(month, 'YYYY_MM'),
+                tbl,
+                month,
+                (month + interval '1 month')::date
+            );
+            month := (month + interval '1 month')::date;
+        END LOOP;
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', tbl || '_default', tbl);
+    END LOOP;
+END;
+$$;
+"""
+
+AUDIT_TRIGGER = """
+CREATE TRIGGER shifts_shift_audit
+AFTER UPDATE ON shifts_shift
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION shifts_shift_audit();
+
+ALTER TABLE shifts_shift DISABLE TRIGGER shifts_shift_audit;
+"""
+
+SHIFT_INDEXES = """
+CREATE UNIQUE INDEX uniq_attendance_worker_date ON shifts_shift (recorded_by_worker_id, attendance_date)
+    WHERE recorded_by_worker_id IS NOT NULL;
+CREATE UNIQUE INDEX uniq_attendance_staff_date ON shifts_shift (recorded_by_staff_id, attendance_date)
+    WHERE recorded_by_staff_id IS NOT NULL;
+CREATE INDEX shift_date_id_idx ON shifts_shift (attendance_date, id);
+CREATE INDEX shift_status_date_idx ON shifts_shift (status, attendance_date);
+CREATE INDEX shift_type_date_idx ON shifts_shift (shift_type, attendance_date);
+CREATE INDEX shift_reason_date_idx ON shifts_shift (absence_reason, attendance_date)
+    WHERE absence_reason IS NOT NULL;
+ALTER TABLE shifts_shift ADD CONSTRAINT shifts_shift_recorded_by_worker_id_fk
+    FOREIGN KEY (recorded_by_worker_id) REFERENCES accounts_worker (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE shifts_shift ADD CONSTRAINT shifts_shift_recorded_by_staff_id_fk
+    FOREIGN KEY (recorded_by_staff_id) REFERENCES accounts_staff (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX shiftaudit_shift_created_idx ON shifts_shiftaudit (shift_id, created);
+CREATE INDEX shiftaudit_created_id_idx ON shifts_shiftaudit (created, id);
+"""
+
+# Primary keys must contain the partition key, so they become (id, attendance_date).
+# The two partial unique indexes already include attendance_date and carry over
+# unchanged. ShiftAudit loses its FK to Shift: a partitioned table has no unique
+# key on id alone to reference. Django still cascades deletes itself.
+PARTITION = f"""
+ALTER TABLE shifts_shiftaudit RENAME TO shifts_shiftaudit_unpartitioned;
+ALTER TABLE shifts_shift RENAME TO shifts_shift_unpartitioned;
+
+CREATE TABLE shifts_shift (LIKE shifts_shift_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    PARTITION BY RANGE (attendance_date);
+CREATE TABLE shifts_shiftaudit (LIKE shifts_shiftaudit_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    PARTITION BY RANGE (attendance_date);
+{CREATE_MONTHLY_PARTITIONS}
+
+INSERT INTO shifts_shift SELECT * FROM shifts_shift_unpartitioned;
+INSERT INTO shifts_shiftaudit SELECT * FROM shifts_shiftaudit_unpartitioned;
+DROP TABLE shifts_shiftaudit_unpartitioned;
+DROP TABLE shifts_shift_unpartitioned;
+
+ALTER TABLE shifts_shift ADD PRIMARY KEY (id, attendance_date);
+ALTER TABLE shifts_shiftaudit ADD PRIMARY KEY (id, attendance_date);
+{SHIFT_INDEXES}
+{AUDIT_TRIGGER}
+"""
+
+UNPARTITION = f"""
+ALTER TABLE shifts_shiftaudit RENAME TO shifts_shiftaudit_partitioned;
+ALTER TABLE shifts_shift RENAME TO shifts_shift_partitioned;
+
+CREATE TABLE shifts_shift (LIKE shifts_shift_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+CREATE TABLE shifts_shiftaudit (LIKE shifts_shiftaudit_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+INSERT INTO shifts_shift SELECT * FROM shifts_shift_partitioned;
+INSERT INTO shifts_shiftaudit SELECT * FROM shifts_shiftaudit_partitioned;
+DROP TABLE shifts_shiftaudit_partitioned;
+DROP TABLE shifts_shift_partitioned;
+
+ALTER TABLE shifts_shift ADD PRIMARY KEY (id);
+ALTER TABLE shifts_shiftaudit ADD PRIMARY KEY (id);
+{SHIFT_INDEXES}
+CREATE INDEX shifts_shift_recorded_by_worker_id_idx ON shifts_shift (recorded_by_worker_id);
+CREATE INDEX shifts_shift_recorded_by_staff_id_idx ON shifts_shift (recorded_by_staff_id);
+ALTER TABLE shifts_shiftaudit ADD CONSTRAINT shifts_shiftaudit_shift_id_fk
+    FOREIGN KEY (shift_id) REFERENCES shifts_shift (id) DEFERRABLE INITIALLY DEFERRED;
+{AUDIT_TRIGGER}
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_alter_staff_company"),
+        ("shifts", "0009_shiftaudit_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunSQL(PARTITION, UNPARTITION)],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="shiftaudit",
+                    name="shift",
+                    field=models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to="shifts.shift",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,200 @@
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+# Frozen copy of shifts.summary.COUNTERS.
+COUNTERS = {
+    "shifts": "TRUE",
+    "present": "c.status = 'present'",
+    "absent": "c.status = 'absent'",
+    "day_shifts": "c.shift_type = 'day'",
+    "night_shifts": "c.shift_type = 'night'",
+    "absent_sick": "c.absence_reason = 'sick'",
+    "absent_site_out": "c.absence_reason = 'site_out'",
+    "absent_no_work": "c.absence_reason = 'no_work'",
+    "absent_safety": "c.absence_reason = 'safety'",
+    "absent_training": "c.absence_reason = 'training'",
+}
+SUMMARY_FIELDS = (*COUNTERS, "hours")
+RECORDERS = {
+    "worker": ("recorded_by_worker_id", "accounts_worker"),
+    "staff": ("recorded_by_staff_id", "accounts_staff"),
+}
+# Columns that feed a summary; updates touching none of them are skipped.
+SUMMARY_COLUMNS = (
+    "recorded_by_worker_id, recorded_by_staff_id, attendance_date, status, shift_type, absence_reason, hours"
+)
+
+
+def _apply(recorder, changes):
+    shift_column, recorder_table = RECORDERS[recorder]
+    sums = [f"sum(CASE WHEN {condition} THEN c.sign ELSE 0 END)" for condition in COUNTERS.values()]
+    sums.append("sum(c.sign * COALESCE(c.hours, 0))")
+    updates = [f"{field} = t.{field} + EXCLUDED.{field}" for field in SUMMARY_FIELDS]
+    updates += ["modified = EXCLUDED.modified", "company_id = EXCLUDED.company_id"]
+    return (
+        f"INSERT INTO shifts_shiftmonthsummary AS t "
+        f"(id, created, modified, company_id, {recorder}_id, month, {', '.join(SUMMARY_FIELDS)}) "
+        f"SELECT gen_random_uuid(), now(), now(), r.company_id, c.{shift_column}, "
+        f"date_trunc('month', c.attendance_date)::date, {', '.join(sums)} "
+        f"FROM ({changes}) AS c LEFT JOIN {recorder_table} r ON r.id = c.{shift_column} "
+        f"WHERE c.{shift_column} IS NOT NULL "
+        f"GROUP BY c.{shift_column}, date_trunc('month', c.attendance_date), r.company_id "
+        f"ORDER BY 5, 6 "
+        f"ON CONFLICT ({recorder}_id, month) WHERE {recorder}_id IS NOT NULL "
+        f"DO UPDATE SET {', '.join(updates)};"
+    )
+
+
+def _apply_all(changes):
+    return "\n        ".join(_apply(recorder, changes) for recorder in RECORDERS)
+
+
+CHANGED = (
+    f"JOIN new_rows n ON n.id = o.id "
+    f"WHERE ({', '.join('o.' + c for c in SUMMARY_COLUMNS.split(', '))}) "
+    f"IS DISTINCT FROM ({', '.join('n.' + c for c in SUMMARY_COLUMNS.split(', '))})"
+)
+INSERTED = "SELECT 1 AS sign, * FROM new_rows"
+DELETED = "SELECT -1 AS sign, * FROM old_rows"
+UPDATED = (
+    f"SELECT -1 AS sign, o.* FROM old_rows o {CHANGED} "
+    f"UNION ALL SELECT 1 AS sign, n.* FROM old_rows o {CHANGED}"
+)
+
+CREATE_TRIGGERS = f"""
+CREATE FUNCTION shifts_shift_summary() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_apply_all(INSERTED)}
+    ELSIF TG_OP = 'UPDATE' THEN
+        {_apply_all(UPDATED)}
+    ELSE
+        {_apply_all(DELETED)}
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER shifts_shift_summary_insert
+AFTER INSERT ON shifts_shift
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION shifts_shift_summary();
+
+CREATE TRIGGER shifts_shift_summary_update
+AFTER UPDATE ON shifts_shift
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION shifts_shift_summary();
+
+CREATE TRIGGER shifts_shift_summary_delete
+AFTER DELETE ON shifts_shift
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION shifts_shift_summary();
+
+{_apply_all("SELECT 1 AS sign, * FROM shifts_shift")}
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS shifts_shift_summary_insert ON shifts_shift;
+DROP TRIGGER IF EXISTS shifts_shift_summary_update ON shifts_shift;
+DROP TRIGGER IF EXISTS shifts_shift_summary_delete ON shifts_shift;
+DROP FUNCTION IF EXISTS shifts_shift_summary();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_alter_staff_company"),
+        ("shifts", "0010_partition_by_attendance_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShiftMonthSummary",
+            fields=[
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "id",
+                    model_utils.fields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+                ),
+                ("month", models.DateField()),
+                ("shifts", models.IntegerField(default=0)),
+                ("present", models.IntegerField(default=0)),
+                ("absent", models.IntegerField(default=0)),
+                ("day_shifts", models.IntegerField(default=0)),
+                ("night_shifts", models.IntegerField(default=0)),
+                ("hours", models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ("absent_sick", models.IntegerField(default=0)),
+                ("absent_site_out", models.IntegerField(default=0)),
+                ("absent_no_work", models.IntegerField(default=0)),
+                ("absent_safety", models.IntegerField(default=0)),
+                ("absent_training", models.IntegerField(default=0)),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shift_summaries",
+                        to="accounts.company",
+                    ),
+                ),
+                (
+                    "staff",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shift_summaries",
+                        to="accounts.staff",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shift_summaries",
+                        to="accounts.worker",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-month"],
+                "indexes": [models.Index(fields=["company", "month"], name="summary_company_month_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("worker__isnull", False)),
+                        fields=("worker", "month"),
+                        name="uniq_summary_worker_month",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("staff__isnull", False)),
+                        fields=("staff", "month"),
+                        name="uniq_summary_staff_month",
+                    ),
+                ],
+            },
+        ),
+        # Also backfills the summaries from the existing shifts.
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
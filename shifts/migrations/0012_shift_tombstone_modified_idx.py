@@ -0,0 +1,58 @@
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_alter_staff_company"),
+        ("shifts", "0011_shift_month_summary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(fields=["modified", "id"], name="shift_modified_id_idx"),
+        ),
+        migrations.CreateModel(
+            name="ShiftTombstone",
+            fields=[
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "id",
+                    model_utils.fields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+                ),
+                ("shift_id", models.UUIDField()),
+                ("attendance_date", models.DateField()),
+                (
+                    "company",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shift_tombstones",
+                        to="accounts.company",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["modified"],
+                "indexes": [
+                    models.Index(fields=["company", "modified", "id"], name="tombstone_company_modified_idx")
+                ],
+            },
+        ),
+    ]
@@ -1,10 +1,117 @@
+import datetime
+
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models
 from django.db.models import Q
 
+from accounts.models.company import Company
 from accounts.models.staff import Staff
 from accounts.models.worker import Worker
 from core.models import BaseModel
+from shifts.audit import python_audit_enabled
+
+
+# Columns tracked by ShiftAudit. A field's position is its bit in
+# ``ShiftAudit.changed_fields``, so only ever append to this tuple.
+AUDITED_FIELDS = (
+    "attendance_date",
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+    "recorded_by_worker_id",
+    "recorded_by_staff_id",
+)
+
+
+def shift_changed(previous, shift):
+    return any(previous[field] != getattr(shift, field) for field in AUDITED_FIELDS)
+
+
+class ShiftQuerySet(models.QuerySet):
+    def for_company(self, company_id):
+        # Two IN subqueries instead of an OR across joins, so each side can use
+        # the (recorded_by_*, attendance_date) unique indexes.
+        return self.filter(
+            Q(recorded_by_staff__in=Staff.objects.filter(company_id=company_id).values("id"))
+            | Q(recorded_by_worker__in=Worker.objects.filter(company_id=company_id).values("id"))
+        )
+
+    def as_of(self, instant, date_from=None, date_to=None):
+        """Return the shifts of this queryset as they were at ``instant``.
+
+        Each field takes the old value from the earliest later ShiftAudit that
+        changed it, falling back to the current value, all in one statement.
+        Shifts created after ``instant`` are left out. ``date_from``/``date_to``
+        filter on the historical attendance date. Returns a RawQuerySet.
+
+        Archived audit rows are not read, so ``instant`` must not be older than
+        ``SHIFT_AUDIT_RETENTION_DAYS``.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        audit_table = quote(ShiftAudit._meta.db_table)
+
+        shifts = self.order_by()
+        if date_from or date_to:
+            # A shift could only have had a date in range if it has it now or an
+            # audit row after ``instant`` recorded it.
+            dates = {}
+            if date_from:
+                dates["attendance_date__gte"] = date_from
+            if date_to:
+                dates["attendance_date__lte"] = date_to
+            moved = ShiftAudit.objects.filter(created__gt=instant, **dates).values("shift_id")
+            shifts = shifts.filter(Q(**dates) | Q(id__in=moved))
+        base_sql, base_params = shifts.values("id").query.sql_with_params()
+
+        columns = []
+        for field in self.model._meta.concrete_fields:
+            column = f"s.{quote(field.column)}"
+            if field.attname in AUDITED_FIELDS:
+                column = (
+                    f"CASE WHEN o.old ? '{field.attname}' "
+                    f"THEN (o.old ->> '{field.attname}')::{field.db_type(connection)} ELSE {column} END"
+                )
+            elif field.attname == "modified":
+                column = f"CASE WHEN o.shift_id IS NULL THEN {column} ELSE COALESCE(m.modified, s.created) END"
+            columns.append(f"{column} AS {quote(field.column)}")
+
+        sql = (
+            f"WITH changes AS ("
+            f"SELECT DISTINCT ON (a.shift_id, c.key) a.shift_id, c.key, c.value "
+            f"FROM {audit_table} a CROSS JOIN LATERAL jsonb_each_text(a.diff) AS c(key, value) "
+            f"WHERE a.created > %s AND a.shift_id IN ({base_sql}) "
+            f"ORDER BY a.shift_id, c.key, a.created, a.id"
+            f"), overlay AS ("
+            f"SELECT shift_id, jsonb_object_agg(key, value) AS old FROM changes GROUP BY shift_id"
+            f"), last_change AS ("
+            f"SELECT a.shift_id, max(a.created) AS modified FROM {audit_table} a "
+            f"WHERE a.created <= %s AND a.shift_id IN (SELECT shift_id FROM overlay) GROUP BY a.shift_id"
+            f") SELECT * FROM ("
+            f"SELECT {', '.join(columns)} FROM {quote(self.model._meta.db_table)} s "
+            f"LEFT JOIN overlay o ON o.shift_id = s.id LEFT JOIN last_change m ON m.shift_id = s.id "
+            f"WHERE s.created <= %s AND s.id IN ({base_sql})"
+            f") AS historical"
+        )
+        params = [instant, *base_params, instant, instant, *base_params]
+        filters = []
+        if date_from:
+            filters.append("historical.attendance_date >= %s")
+            params.append(date_from)
+        if date_to:
+            filters.append("historical.attendance_date <= %s")
+            params.append(date_to)
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        sql += " ORDER BY historical.attendance_date DESC, historical.id DESC"
+        return self.model.objects.db_manager(self.db).raw(sql, params)
 
 
 class Shift(BaseModel):
@@ -54,6 +161,8 @@ class Shift(BaseModel):
         blank=True,
     )
 
+    objects = ShiftQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -67,6 +176,17 @@ class Shift(BaseModel):
                 name="uniq_attendance_staff_date",
             ),
         ]
+        indexes = [
+            models.Index(fields=["attendance_date", "id"], name="shift_date_id_idx"),
+            models.Index(fields=["status", "attendance_date"], name="shift_status_date_idx"),
+            models.Index(fields=["shift_type", "attendance_date"], name="shift_type_date_idx"),
+            models.Index(
+                fields=["absence_reason", "attendance_date"],
+                condition=Q(absence_reason__isnull=False),
+                name="shift_reason_date_idx",
+            ),
+            models.Index(fields=["modified", "id"], name="shift_modified_id_idx"),
+        ]
         ordering = ["-attendance_date", "recorded_by_worker", "recorded_by_staff"]
 
     def __str__(self) -> str:
@@ -87,101 +207,197 @@ class Shift(BaseModel):
             raise ValidationError({"absence_reason": "Absence reason is required for absent status."})
 
     def save(self, *args, **kwargs):
+        if not python_audit_enabled():
+            return super().save(*args, **kwargs)
         previous = None
         if self.pk:
-            previous = (
-                Shift.objects.filter(pk=self.pk)
-                .values(
-                    "attendance_date",
-                    "shift_type",
-                    "status",
-                    "absence_reason",
-                    "hours",
-                    "start_date_time",
-                    "end_date_time",
-                    "worker_start_date_time",
-                    "worker_end_date_time",
-                    "staff_start_date_time",
-                    "staff_end_date_time",
-                    "recorded_by_worker_id",
-                    "recorded_by_staff_id",
-                )
-                .first()
-            )
+            previous = Shift.objects.filter(pk=self.pk).values(*AUDITED_FIELDS).first()
         super().save(*args, **kwargs)
-        if not previous:
-            return
-        current = {
-            "attendance_date": self.attendance_date,
-            "shift_type": self.shift_type,
-            "status": self.status,
-            "absence_reason": self.absence_reason,
-            "hours": self.hours,
-            "start_date_time": self.start_date_time,
-            "end_date_time": self.end_date_time,
-            "worker_start_date_time": self.worker_start_date_time,
-            "worker_end_date_time": self.worker_end_date_time,
-            "staff_start_date_time": self.staff_start_date_time,
-            "staff_end_date_time": self.staff_end_date_time,
-        }
-        if any(previous[key] != current[key] for key in current):
-            ShiftAudit.objects.create(
-                shift=self,
-                recorded_by_worker_id=previous["recorded_by_worker_id"],
-                recorded_by_staff_id=previous["recorded_by_staff_id"],
-                attendance_date=previous["attendance_date"],
-                shift_type=previous["shift_type"],
-                status=previous["status"],
-                absence_reason=previous["absence_reason"],
-                hours=previous["hours"],
-                start_date_time=previous["start_date_time"],
-                end_date_time=previous["end_date_time"],
-                worker_start_date_time=previous["worker_start_date_time"],
-                worker_end_date_time=previous["worker_end_date_time"],
-                staff_start_date_time=previous["staff_start_date_time"],
-                staff_end_date_time=previous["staff_end_date_time"],
-            )
+        if previous and shift_changed(previous, self):
+            ShiftAudit.from_changes(self.pk, previous, self).save()
 
 
 class ShiftAudit(BaseModel):
+    """The previous values of the fields changed by one update of a Shift.
+
+    Only changed fields are stored: ``diff`` maps their attnames to the old
+    value as text (or null) and ``changed_fields`` is the matching bitmask over
+    ``AUDITED_FIELDS``. Use ``snapshot()`` to rebuild the full previous row.
+    """
+
     shift = models.ForeignKey(
         Shift,
         on_delete=models.CASCADE,
         related_name="changes",
+        # Covered by shiftaudit_shift_created_idx.
+        db_index=False,
+        # Both tables are partitioned by attendance_date, so shifts_shift has no
+        # unique key on id alone for a database FK; Django emulates the cascade.
+        db_constraint=False,
     )
-    recorded_by_worker = models.ForeignKey(
+    attendance_date = models.DateField()
+    changed_fields = models.PositiveIntegerField(default=0)
+    diff = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["shift", "created"], name="shiftaudit_shift_created_idx"),
+            models.Index(fields=["created", "id"], name="shiftaudit_created_id_idx"),
+        ]
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return f"{self.shift} • {', '.join(self.changed_field_names)}"
+
+    @classmethod
+    def from_changes(cls, shift_id, previous, shift):
+        """Build an unsaved audit row from an ``AUDITED_FIELDS`` dict and the new ``shift``."""
+        diff = {}
+        changed_fields = 0
+        for bit, field in enumerate(AUDITED_FIELDS):
+            if previous[field] != getattr(shift, field):
+                diff[field] = encode_audit_value(previous[field])
+                changed_fields |= 1 << bit
+        return cls(
+            shift_id=shift_id,
+            attendance_date=previous["attendance_date"],
+            changed_fields=changed_fields,
+            diff=diff,
+        )
+
+    @property
+    def changed_field_names(self):
+        return [field for bit, field in enumerate(AUDITED_FIELDS) if self.changed_fields & (1 << bit)]
+
+    def decoded_diff(self):
+        return {field: decode_audit_value(field, value) for field, value in self.diff.items()}
+
+    def snapshot(self):
+        """Rebuild the full ``AUDITED_FIELDS`` row as it was before this change.
+
+        Starts from the current Shift and undoes this change and every later
+        one, newest first.
+        """
+        state = Shift.objects.filter(pk=self.shift_id).values(*AUDITED_FIELDS).get()
+        later = (
+            ShiftAudit.objects.filter(shift_id=self.shift_id, created__gte=self.created)
+            .exclude(created=self.created, id__lt=self.id)
+            .order_by("-created", "-id")
+            .values_list("diff", flat=True)
+        )
+        for diff in later:
+            state.update({field: decode_audit_value(field, value) for field, value in diff.items()})
+        return state
+
+
+class ShiftMonthSummary(BaseModel):
+    """Per-recorder monthly totals over Shift, kept current by database triggers.
+
+    Migration 0011 installs statement-level triggers on ``shifts_shift`` that
+    add the inserted rows and subtract the deleted ones, so every write path
+    (``save()``, the upserts, ``QuerySet.update()``/``delete()``) keeps these
+    rows in step. ``manage.py rebuild_shift_summaries`` recomputes them.
+    """
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="shift_summaries",
+        null=True,
+        blank=True,
+        # Covered by summary_company_month_idx.
+        db_index=False,
+    )
+    worker = models.ForeignKey(
         Worker,
-        on_delete=models.SET_NULL,
-        related_name="shift_audits",
+        on_delete=models.CASCADE,
+        related_name="shift_summaries",
         null=True,
         blank=True,
+        # Covered by uniq_summary_worker_month.
+        db_index=False,
     )
-    recorded_by_staff = models.ForeignKey(
+    staff = models.ForeignKey(
         Staff,
-        on_delete=models.SET_NULL,
-        related_name="shift_audits",
+        on_delete=models.CASCADE,
+        related_name="shift_summaries",
         null=True,
         blank=True,
+        # Covered by uniq_summary_staff_month.
+        db_index=False,
     )
+    # First day of the month.
+    month = models.DateField()
+    shifts = models.IntegerField(default=0)
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+    day_shifts = models.IntegerField(default=0)
+    night_shifts = models.IntegerField(default=0)
+    hours = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    absent_sick = models.IntegerField(default=0)
+    absent_site_out = models.IntegerField(default=0)
+    absent_no_work = models.IntegerField(default=0)
+    absent_safety = models.IntegerField(default=0)
+    absent_training = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["worker", "month"],
+                condition=Q(worker__isnull=False),
+                name="uniq_summary_worker_month",
+            ),
+            models.UniqueConstraint(
+                fields=["staff", "month"],
+                condition=Q(staff__isnull=False),
+                name="uniq_summary_staff_month",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["company", "month"], name="summary_company_month_idx"),
+        ]
+        ordering = ["-month"]
+
+    def __str__(self) -> str:
+        return f"{self.worker or self.staff} • {self.month:%Y-%m}"
+
+
+class ShiftTombstone(BaseModel):
+    """Marks a deleted Shift so delta sync clients can drop their copy.
+
+    ``modified`` is the deletion time and orders tombstones into the same
+    ``(modified, id)`` stream as changed shifts.
+    """
+
+    shift_id = models.UUIDField()
     attendance_date = models.DateField()
-    shift_type = models.CharField(max_length=10, choices=Shift.ShiftType.choices)
-    status = models.CharField(max_length=20, choices=Shift.Status.choices)
-    absence_reason = models.CharField(
-        max_length=20,
-        choices=Shift.AbsenceReason.choices,
-        null=True,
-        blank=True,
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="shift_tombstones",
+        # Covered by tombstone_company_modified_idx.
+        db_index=False,
     )
-    hours = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
-    start_date_time = models.DateTimeField(null=True, blank=True)
-    end_date_time = models.DateTimeField(null=True, blank=True)
-    worker_start_date_time = models.DateTimeField(null=True, blank=True)
-    worker_end_date_time = models.DateTimeField(null=True, blank=True)
-    staff_start_date_time = models.DateTimeField(null=True, blank=True)
-    staff_end_date_time = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["company", "modified", "id"], name="tombstone_company_modified_idx"),
+        ]
+        ordering = ["modified"]
 
     def __str__(self) -> str:
-        return f"{self.shift} • {self.status}"
+        return f"{self.shift_id} • {self.attendance_date}"
+
+
+def encode_audit_value(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def decode_audit_value(field, value):
+    if value is None:
+        return None
+    return Shift._meta.get_field(field).to_python(value)
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import datetime
+import json
+import uuid
+
+from django.conf import settings
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_page_size(value, *, default, maximum):
+    if value in (None, ""):
+        return default
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("page_size must be an integer") from exc
+    if page_size < 1:
+        raise InvalidCursor("page_size must be positive")
+    return min(page_size, maximum)
+
+
+class ShiftKeysetPaginator:
+    """Newest-first keyset pagination over ``(attendance_date, id)``.
+
+    The cursor carries the last row's key, so rows inserted between page
+    requests never shift or duplicate the pages that follow.
+    """
+
+    def __init__(self, *, page_size=None, max_page_size=None):
+        self.max_page_size = max_page_size or settings.SHIFT_LIST_MAX_PAGE_SIZE
+        self.page_size = min(page_size or settings.SHIFT_LIST_PAGE_SIZE, self.max_page_size)
+
+    def paginate(self, queryset, params, key=None):
+        """Return ``(rows, next_cursor)``.
+
+        ``key`` maps a row to its ``(attendance_date, id)``; the default reads
+        model instances, pass one for ``values_list()`` rows.
+        """
+        page_size = parse_page_size(
+            params.get("page_size"),
+            default=self.page_size,
+            maximum=self.max_page_size,
+        )
+        queryset = queryset.order_by("-attendance_date", "-id")
+
+        cursor = params.get("cursor")
+        if cursor:
+            queryset = queryset.filter(self._after(decode_cursor(cursor)))
+
+        rows = list(queryset[: page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            attendance_date, shift_id = key(rows[-1]) if key else (rows[-1].attendance_date, rows[-1].id)
+            next_cursor = encode_cursor([attendance_date.isoformat(), str(shift_id)])
+        return rows, next_cursor
+
+    @staticmethod
+    def _after(values):
+        try:
+            attendance_date, shift_id = values
+            attendance_date = datetime.date.fromisoformat(attendance_date)
+            shift_id = uuid.UUID(shift_id)
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Invalid cursor") from exc
+        return Q(attendance_date__lte=attendance_date) & (
+            Q(attendance_date__lt=attendance_date) | Q(id__lt=shift_id)
+        )
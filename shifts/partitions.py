@@ -0,0 +1,88 @@
+import datetime
+import re
+
+from django.db import transaction
+from django.db.utils import DatabaseError
+
+from shifts.models import Shift, ShiftAudit
+
+# Both tables are range-partitioned by month on attendance_date (migration 0010).
+PARTITIONED_MODELS = (Shift, ShiftAudit)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_months(connection, table):
+    """Map month -> partition name for the monthly partitions attached to ``table``."""
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    months = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            months[datetime.date(int(match[1]), int(match[2]), 1)] = name
+    return months
+
+
+def create_partitions(connection, first_month, last_month):
+    """Create the missing monthly partitions from ``first_month`` to ``last_month``.
+
+    Yields ``(name, error)`` for each partition attempted; ``error`` is None on
+    success. Creation fails when the default partition already holds rows for
+    that month, which needs a manual move.
+    """
+    quote = connection.ops.quote_name
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        existing = partition_months(connection, table)
+        month = first_month
+        while month <= last_month:
+            if month not in existing:
+                name = partition_name(table, month)
+                try:
+                    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                        cursor.execute(
+                            f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} "
+                            f"FOR VALUES FROM (%s) TO (%s)",
+                            [month, add_months(month, 1)],
+                        )
+                except DatabaseError as exc:
+                    yield name, exc
+                else:
+                    yield name, None
+            month = add_months(month, 1)
+
+
+def detach_partitions(connection, before_month):
+    """Detach the monthly partitions that end on or before ``before_month``.
+
+    Detached partitions stay in the database as plain tables, so they can be
+    archived or dropped separately. Yields the detached table names.
+    """
+    quote = connection.ops.quote_name
+    # Audits first, so no attached audit partition outlives its shifts.
+    for model in reversed(PARTITIONED_MODELS):
+        table = model._meta.db_table
+        for month, name in sorted(partition_months(connection, table).items()):
+            if month >= before_month:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+            yield name
@@ -0,0 +1,221 @@
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField, Func
+
+from shifts.models import Shift
+
+DAY = 86400.0
+# 1970-01-01 was a Thursday; shifting by three days makes weeks start on Monday.
+WEEK_OFFSET = 3
+TIME_PAIRS = (
+    ("staff_start_date_time", "staff_end_date_time"),
+    ("worker_start_date_time", "worker_end_date_time"),
+    ("start_date_time", "end_date_time"),
+)
+
+
+class Epoch(Func):
+    """Seconds since 1970-01-01 UTC as a float, so rows load without datetime objects."""
+
+    template = "EXTRACT(EPOCH FROM %(expressions)s)::double precision"
+    output_field = FloatField()
+
+
+class ShiftArrays:
+    """A date range of shifts as column arrays, one element per shift.
+
+    ``recorder`` holds an integer code per worker or staff member; ``recorders``
+    maps the codes back to ``("worker" | "staff", id)``. Times are seconds since
+    the epoch with NaN for missing values; ``day`` is days since the epoch.
+    """
+
+    def __init__(self, ids, recorders, recorder, day, night, absent, manual_hours, times):
+        self.ids = ids
+        self.recorders = recorders
+        self.recorder = recorder
+        self.day = day
+        self.night = night
+        self.absent = absent
+        self.manual_hours = manual_hours
+        self.times = times
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, queryset):
+        """Fetch ``queryset`` in one query and convert it column by column."""
+        time_fields = [name for pair in TIME_PAIRS for name in pair]
+        rows = list(
+            queryset.order_by()
+            .annotate(**{f"{name}_epoch": Epoch(name) for name in time_fields})
+            .values_list(
+                "id",
+                "recorded_by_worker_id",
+                "recorded_by_staff_id",
+                "attendance_date",
+                "shift_type",
+                "status",
+                "hours",
+                *(f"{name}_epoch" for name in time_fields),
+            )
+        )
+        columns = list(zip(*rows)) or [()] * (7 + len(time_fields))
+
+        codes = {}
+        recorder = np.fromiter(
+            (
+                codes.setdefault(("worker", worker) if worker else ("staff", staff), len(codes))
+                for worker, staff in zip(columns[1], columns[2])
+            ),
+            dtype=np.int64,
+            count=len(rows),
+        )
+        day = np.array(columns[3], dtype="datetime64[D]").astype(np.int64)
+        times = {name: np.array(column, dtype=np.float64) for name, column in zip(time_fields, columns[7:])}
+        return cls(
+            ids=list(columns[0]),
+            recorders=list(codes),
+            recorder=recorder,
+            day=day,
+            night=np.array(columns[4], dtype=object) == Shift.ShiftType.NIGHT,
+            absent=np.array(columns[5], dtype=object) == Shift.Status.ABSENT,
+            manual_hours=np.array(columns[6], dtype=np.float64),
+            times=times,
+        )
+
+
+def _duration(start, end, night):
+    seconds = end - start
+    # Night shifts are often entered with both times on the attendance date.
+    seconds = np.where((seconds <= 0) & night, seconds + DAY, seconds)
+    # Anything else that is not a positive span of at most a day is unusable.
+    return np.where((seconds > 0) & (seconds <= DAY), seconds, np.nan)
+
+
+def compute_hours(
+    shifts,
+    *,
+    rounding_minutes=None,
+    daily_overtime_hours=None,
+    weekly_overtime_hours=None,
+    tolerance_minutes=None,
+):
+    """Compute effective, regular and overtime hours for every shift in ``shifts``.
+
+    Effective time comes from the staff-confirmed times, else the worker's
+    times, else the scheduled start/end, else the hand-entered ``hours``;
+    absences count zero. It is rounded to ``rounding_minutes``. Hours above
+    ``daily_overtime_hours`` in a shift, then regular hours above
+    ``weekly_overtime_hours`` in a Monday-to-Sunday week per recorder, are
+    overtime. ``discrepancy`` flags shifts whose worker and staff times differ
+    by more than ``tolerance_minutes``. Defaults come from the SHIFT_PAYROLL_*
+    settings. Returns a dict of arrays aligned with ``shifts``.
+    """
+    if rounding_minutes is None:
+        rounding_minutes = settings.SHIFT_PAYROLL_ROUNDING_MINUTES
+    if daily_overtime_hours is None:
+        daily_overtime_hours = settings.SHIFT_PAYROLL_DAILY_OVERTIME_HOURS
+    if weekly_overtime_hours is None:
+        weekly_overtime_hours = settings.SHIFT_PAYROLL_WEEKLY_OVERTIME_HOURS
+    if tolerance_minutes is None:
+        tolerance_minutes = settings.SHIFT_PAYROLL_TOLERANCE_MINUTES
+
+    times = shifts.times
+    seconds = np.full(len(shifts), np.nan)
+    for start, end in reversed(TIME_PAIRS):
+        duration = _duration(times[start], times[end], shifts.night)
+        seconds = np.where(np.isnan(duration), seconds, duration)
+    seconds = np.where(np.isnan(seconds), shifts.manual_hours * 3600, seconds)
+    seconds = np.where(shifts.absent | np.isnan(seconds), 0.0, seconds)
+
+    if rounding_minutes:
+        step = rounding_minutes * 60
+        seconds = np.round(seconds / step) * step
+    hours = seconds / 3600
+
+    tolerance = tolerance_minutes * 60
+    drift = np.fmax(
+        np.abs(times["worker_start_date_time"] - times["staff_start_date_time"]),
+        np.abs(times["worker_end_date_time"] - times["staff_end_date_time"]),
+    )
+    # NaN compares False, so shifts missing either side are not flagged.
+    discrepancy = drift > tolerance
+
+    daily_overtime = np.maximum(hours - daily_overtime_hours, 0.0)
+    regular = hours - daily_overtime
+
+    # Running regular hours per (recorder, week) in date order.
+    week = (shifts.day + WEEK_OFFSET) // 7
+    order = np.lexsort((shifts.day, week, shifts.recorder))
+    sorted_regular = regular[order]
+    group = np.empty(len(order), dtype=bool)
+    group[:1] = True
+    group[1:] = (np.diff(shifts.recorder[order]) != 0) | (np.diff(week[order]) != 0)
+    running = np.cumsum(sorted_regular)
+    starts = np.flatnonzero(group)
+    offsets = np.repeat(running[starts] - sorted_regular[starts], np.diff(np.append(starts, len(order))))
+    running -= offsets
+    weekly_sorted = np.maximum(running - weekly_overtime_hours, 0.0) - np.maximum(
+        running - sorted_regular - weekly_overtime_hours, 0.0
+    )
+    weekly_overtime = np.empty_like(weekly_sorted)
+    weekly_overtime[order] = weekly_sorted
+
+    return {
+        "hours": hours,
+        "regular": regular - weekly_overtime,
+        "overtime": daily_overtime + weekly_overtime,
+        "discrepancy": discrepancy,
+    }
+
+
+def payroll_totals(shifts, result):
+    """Sum ``compute_hours()`` output per recorder."""
+    count = len(shifts.recorders)
+    totals = {
+        name: np.bincount(shifts.recorder, weights=result[name], minlength=count)
+        for name in ("hours", "regular", "overtime")
+    }
+    discrepancies = np.bincount(shifts.recorder, weights=result["discrepancy"], minlength=count)
+    return [
+        {
+            kind: recorder_id,
+            "hours": round(float(totals["hours"][code]), 2),
+            "regular": round(float(totals["regular"][code]), 2),
+            "overtime": round(float(totals["overtime"][code]), 2),
+            "discrepancies": int(discrepancies[code]),
+        }
+        for code, (kind, recorder_id) in enumerate(shifts.recorders)
+    ]
+
+
+def payroll_for_range(queryset, date_from, date_to, **rules):
+    """Compute payroll for the shifts of ``queryset`` between two dates.
+
+    Loads from the Monday of ``date_from``'s week so weekly overtime counts the
+    whole first week, then drops the earlier shifts from the result. Returns
+    ``(shifts, result)`` restricted to the range.
+    """
+    week_start = date_from - datetime.timedelta(days=date_from.weekday())
+    shifts = ShiftArrays.load(queryset.filter(attendance_date__range=(week_start, date_to)))
+    result = compute_hours(shifts, **rules)
+    keep = shifts.day >= (date_from - datetime.date(1970, 1, 1)).days
+    if keep.all():
+        return shifts, result
+    codes = np.unique(shifts.recorder[keep])
+    remap = np.full(len(shifts.recorders), -1, dtype=np.int64)
+    remap[codes] = np.arange(len(codes))
+    kept = ShiftArrays(
+        ids=[shift_id for shift_id, flag in zip(shifts.ids, keep) if flag],
+        recorders=[shifts.recorders[code] for code in codes],
+        recorder=remap[shifts.recorder[keep]],
+        day=shifts.day[keep],
+        night=shifts.night[keep],
+        absent=shifts.absent[keep],
+        manual_hours=shifts.manual_hours[keep],
+        times={name: values[keep] for name, values in shifts.times.items()},
+    )
+    return kept, {name: values[keep] for name, values in result.items()}
@@ -0,0 +1,74 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Sum
+
+from shifts.models import Shift, ShiftMonthSummary
+
+# Counters of ShiftMonthSummary and the condition on a Shift row that each counts.
+COUNTERS = {
+    "shifts": "TRUE",
+    "present": f"c.status = '{Shift.Status.PRESENT}'",
+    "absent": f"c.status = '{Shift.Status.ABSENT}'",
+    "day_shifts": f"c.shift_type = '{Shift.ShiftType.DAY}'",
+    "night_shifts": f"c.shift_type = '{Shift.ShiftType.NIGHT}'",
+    **{f"absent_{reason}": f"c.absence_reason = '{reason}'" for reason in Shift.AbsenceReason.values},
+}
+SUMMARY_FIELDS = (*COUNTERS, "hours")
+RECORDERS = {
+    "worker": ("recorded_by_worker_id", "accounts_worker"),
+    "staff": ("recorded_by_staff_id", "accounts_staff"),
+}
+
+
+def summary_insert_sql(recorder, changes, quote):
+    """Add ``changes`` to the summaries of one kind of recorder.
+
+    ``changes`` is a query over Shift-shaped rows with an extra ``sign`` column,
+    +1 for rows to add and -1 for rows to take away.
+    """
+    shift_column, recorder_table = RECORDERS[recorder]
+    table = quote(ShiftMonthSummary._meta.db_table)
+    columns = ["id", "created", "modified", "company_id", f"{recorder}_id", "month", *SUMMARY_FIELDS]
+    sums = [f"sum(CASE WHEN {condition} THEN c.sign ELSE 0 END)" for condition in COUNTERS.values()]
+    sums.append("sum(c.sign * COALESCE(c.hours, 0))")
+    updates = [f"{quote(field)} = t.{quote(field)} + EXCLUDED.{quote(field)}" for field in SUMMARY_FIELDS]
+    updates += ["modified = EXCLUDED.modified", "company_id = EXCLUDED.company_id"]
+    return (
+        f"INSERT INTO {table} AS t ({', '.join(quote(column) for column in columns)}) "
+        f"SELECT gen_random_uuid(), now(), now(), r.company_id, c.{shift_column}, "
+        f"date_trunc('month', c.attendance_date)::date, {', '.join(sums)} "
+        f"FROM ({changes}) AS c LEFT JOIN {recorder_table} r ON r.id = c.{shift_column} "
+        f"WHERE c.{shift_column} IS NOT NULL "
+        f"GROUP BY c.{shift_column}, date_trunc('month', c.attendance_date), r.company_id "
+        f"ORDER BY 5, 6 "
+        f"ON CONFLICT ({recorder}_id, month) WHERE {recorder}_id IS NOT NULL "
+        f"DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def rebuild_summaries(using=DEFAULT_DB_ALIAS):
+    """Recompute every ShiftMonthSummary row from the shifts.
+
+    Holds a SHARE lock on the shifts table meanwhile, which blocks writes but
+    not reads. Returns the number of summary rows written.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    shifts = f"SELECT 1 AS sign, * FROM {quote(Shift._meta.db_table)}"
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {quote(Shift._meta.db_table)} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {quote(ShiftMonthSummary._meta.db_table)}")
+        written = 0
+        for recorder in RECORDERS:
+            cursor.execute(summary_insert_sql(recorder, shifts, quote))
+            written += cursor.rowcount
+    return written
+
+
+def year_totals(summaries):
+    """Sum monthly ``summaries`` per recorder; at most twelve rows each."""
+    return (
+        summaries.order_by()
+        .values("company", "worker", "staff")
+        .annotate(**{field: Sum(field) for field in SUMMARY_FIELDS})
+        .order_by("worker", "staff")
+    )
@@ -0,0 +1,55 @@
+import datetime
+import heapq
+import uuid
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from shifts.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+TOMBSTONE_FIELDS = ("shift_id", "attendance_date", "modified")
+
+
+def _key(row):
+    # Every row ends with (modified, id).
+    return row[-2], row[-1]
+
+
+def _after(values):
+    try:
+        modified, row_id = values
+        modified = datetime.datetime.fromisoformat(modified)
+        row_id = uuid.UUID(row_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if timezone.is_naive(modified):
+        raise InvalidCursor("Invalid cursor")
+    return Q(modified__gte=modified) & (Q(modified__gt=modified) | Q(id__gt=row_id))
+
+
+def changes_since(shifts, tombstones, fields, cursor=None, *, page_size):
+    """Return ``(shift rows, tombstone rows, next_cursor, has_more)`` after ``cursor``.
+
+    Changed shifts and tombstones form one stream ordered by ``(modified, id)``;
+    the cursor is the last key sent, so a client can resume from any page.
+    Rows modified within ``SHIFT_SYNC_SETTLE_SECONDS`` are held back: a
+    transaction still running may yet commit a row stamped earlier than them.
+    """
+    settled = timezone.now() - datetime.timedelta(seconds=settings.SHIFT_SYNC_SETTLE_SECONDS)
+    streams = []
+    for kind, (queryset, columns) in enumerate(((shifts, fields), (tombstones, TOMBSTONE_FIELDS))):
+        queryset = queryset.filter(modified__lt=settled).order_by("modified", "id")
+        if cursor:
+            queryset = queryset.filter(_after(decode_cursor(cursor)))
+        streams.append([(kind, row) for row in queryset.values_list(*columns, "modified", "id")[: page_size + 1]])
+
+    rows = list(heapq.merge(*streams, key=lambda item: _key(item[1])))
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if rows:
+        modified, row_id = _key(rows[-1][1])
+        cursor = encode_cursor([modified.isoformat(), str(row_id)])
+    changed = [row for kind, row in rows if kind == 0]
+    deleted = [row for kind, row in rows if kind == 1]
+    return changed, deleted, cursor, has_more
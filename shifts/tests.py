@@ -1,3 +1,19 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+
+class StaffShiftBulkUpsertViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username="staff", password="pw"))
+
+    def test_invalid_item_errors_are_keyed_by_index(self):
+        response = self.client.patch(reverse("staff-shift-bulk-upsert"), {"items": [1]}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body["ok"])
+        self.assertEqual(body["message"], "Missing or invalid data")
+        self.assertEqual(list(body["errors"]["items"]), ["0"])
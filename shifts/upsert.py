@@ -0,0 +1,259 @@
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from shifts.audit import python_audit_enabled
+from shifts.models import AUDITED_FIELDS, Shift, ShiftAudit, shift_changed
+
+# Columns written by a staff upsert; the conflict key is (recorded_by_staff, attendance_date).
+UPSERT_FIELDS = (
+    "shift_type",
+    "status",
+    "absence_reason",
+    "hours",
+    "start_date_time",
+    "end_date_time",
+    "worker_start_date_time",
+    "worker_end_date_time",
+    "staff_start_date_time",
+    "staff_end_date_time",
+)
+INSERT_FIELDS = ("id", "created", "modified", "recorded_by_staff", "attendance_date") + UPSERT_FIELDS
+
+
+def _column(name, model=Shift):
+    return connection.ops.quote_name(model._meta.get_field(name).column)
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _insert_sql(row_count, update_fields=UPSERT_FIELDS, returning=None, row=None):
+    """INSERT ... ON CONFLICT for ``row_count`` rows; ``update_fields=None`` means DO NOTHING."""
+    columns = ", ".join(_column(name) for name in INSERT_FIELDS)
+    if row is None:
+        row = "(" + ", ".join(["%s"] * len(INSERT_FIELDS)) + ")"
+    if update_fields is None:
+        action = "DO NOTHING"
+    else:
+        updates = ", ".join(f"{_column(name)} = EXCLUDED.{_column(name)}" for name in update_fields + ("modified",))
+        action = f"DO UPDATE SET {updates}"
+    if returning is None:
+        returning = f"{_column('attendance_date')}, {_column('id')}"
+    # The arbiter has to repeat the partial index predicate, otherwise PostgreSQL
+    # will not match uniq_attendance_staff_date. Django's bulk_create(update_conflicts=True)
+    # cannot express that predicate, hence the hand-written statement.
+    return (
+        f"INSERT INTO {_table(Shift)} ({columns}) "
+        f"VALUES {', '.join([row] * row_count)} "
+        f"ON CONFLICT ({_column('recorded_by_staff')}, {_column('attendance_date')}) "
+        f"WHERE {_column('recorded_by_staff')} IS NOT NULL "
+        f"{action} "
+        f"RETURNING {returning}, (xmax = 0) AS inserted"
+    )
+
+
+def _insert_params(shift):
+    params = []
+    for name in INSERT_FIELDS:
+        field = Shift._meta.get_field(name)
+        params.append(field.get_db_prep_save(getattr(shift, field.attname), connection))
+    return params
+
+
+def _lock_rows(staff, dates):
+    return {
+        row["attendance_date"]: row
+        for row in Shift.objects.select_for_update()
+        .filter(recorded_by_staff=staff, attendance_date__in=dates)
+        .values("id", "created", *AUDITED_FIELDS)
+    }
+
+
+def _build_shift(staff, item, previous, now):
+    """Return ``(shift, None)`` with ``item`` applied to ``previous`` (or a new row), or ``(None, result)``."""
+    if previous is None:
+        if "shift_type" not in item or "status" not in item:
+            return None, {"ok": False, "errors": {"detail": ["shift_type and status are required to create a shift"]}}
+        shift = Shift(id=uuid.uuid4(), created=now, recorded_by_staff=staff)
+    else:
+        shift = Shift(id=previous["id"], created=previous["created"])
+        for field in AUDITED_FIELDS:
+            setattr(shift, field, previous[field])
+    shift.modified = now
+    for field, value in item.items():
+        setattr(shift, field, value)
+
+    try:
+        # Uniqueness is settled by ON CONFLICT and the recorder is known to
+        # exist, so skip the checks that would cost a query per item.
+        shift.full_clean(
+            exclude=["recorded_by_worker", "recorded_by_staff"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+    except ValidationError as exc:
+        return None, {"ok": False, "errors": exc.message_dict}
+    return shift, None
+
+
+def _write_rows(shifts, update_fields):
+    """Run one multi-row upsert; return ``{attendance_date: (id, inserted)}`` for the rows written."""
+    params = []
+    for shift in shifts:
+        params.extend(_insert_params(shift))
+    with connection.cursor() as cursor:
+        cursor.execute(_insert_sql(len(shifts), update_fields), params)
+        return {attendance_date: (shift_id, flag) for attendance_date, shift_id, flag in cursor.fetchall()}
+
+
+def bulk_upsert_staff_shifts(staff, items):
+    """Create or update many of ``staff``'s shifts, keyed by attendance date.
+
+    ``items`` are validated ``StaffShiftUpsertSerializer`` payloads. Returns one
+    result dict per item, in order. Items that fail model validation are reported
+    and skipped. Existing rows are locked, merged with their items and written
+    with one upsert; new rows with one ``ON CONFLICT DO NOTHING`` insert, plus
+    one bulk insert of audit rows.
+
+    A new row that another transaction inserts after the lock loses the
+    conflict; it is then locked and its item applied as an update, so fields
+    the item leaves out keep their values and the change is audited.
+    """
+    results = [None] * len(items)
+    seen_dates = set()
+    for index, item in enumerate(items):
+        attendance_date = item["attendance_date"]
+        if attendance_date in seen_dates:
+            results[index] = {"ok": False, "errors": {"attendance_date": ["Duplicate attendance date in batch."]}}
+        seen_dates.add(attendance_date)
+
+    with transaction.atomic():
+        previous_rows = _lock_rows(staff, seen_dates)
+
+        now = timezone.now()
+        new = []
+        existing = []
+        for index, item in enumerate(items):
+            if results[index] is not None:
+                continue
+            previous = previous_rows.get(item["attendance_date"])
+            shift, results[index] = _build_shift(staff, item, previous, now)
+            if shift is not None:
+                (new if previous is None else existing).append((index, shift, previous))
+
+        if new:
+            inserted = _write_rows([shift for _, shift, _ in new], update_fields=None)
+            raced = [(index, shift) for index, shift, _ in new if shift.attendance_date not in inserted]
+            raced_rows = _lock_rows(staff, {shift.attendance_date for _, shift in raced}) if raced else {}
+            for index, shift, _ in new:
+                if shift.attendance_date in inserted:
+                    results[index] = {"ok": True, "created": True, "shift": shift}
+                    continue
+                previous = raced_rows.get(shift.attendance_date)
+                shift, results[index] = _build_shift(staff, items[index], previous, now)
+                if shift is not None:
+                    existing.append((index, shift, previous))
+
+        audits = []
+        if existing:
+            # Every row here is locked (or, if deleted meanwhile, inserted), so
+            # writing all UPSERT_FIELDS keeps the merged values.
+            written = _write_rows([shift for _, shift, _ in existing], UPSERT_FIELDS)
+            for index, shift, previous in existing:
+                shift.id, created = written[shift.attendance_date]
+                if previous is not None and shift_changed(previous, shift):
+                    audits.append(ShiftAudit.from_changes(shift.id, previous, shift))
+                results[index] = {"ok": True, "created": created, "shift": shift}
+        if audits and python_audit_enabled():
+            ShiftAudit.objects.bulk_create(audits)
+    return results
+
+
+def _single_upsert_sql(update_fields):
+    shift_columns = [field.column for field in Shift._meta.concrete_fields]
+    snapshot = [_column(name) for name in AUDITED_FIELDS]
+    returning = ", ".join(connection.ops.quote_name(column) for column in shift_columns)
+    # Reading ``old`` inside the VALUES row forces the locking read to run
+    # before the insert; sibling CTEs otherwise execute in no defined order.
+    row = ", ".join(
+        f"COALESCE((SELECT {_column('created')} FROM old), %s)" if name == "created" else "%s"
+        for name in INSERT_FIELDS
+    )
+    sql = (
+        f"WITH old AS ("
+        f"SELECT {_column('id')}, {_column('created')}, {', '.join(snapshot)} FROM {_table(Shift)} "
+        f"WHERE {_column('recorded_by_staff')} = %s AND {_column('attendance_date')} = %s FOR UPDATE"
+        f"), up AS ({_insert_sql(1, update_fields, returning, f'({row})')})"
+    )
+    if python_audit_enabled():
+        sql += f", audit AS ({_audit_sql()})"
+    return sql + " SELECT * FROM up"
+
+
+def _audit_value_sql(alias, name):
+    value = f"{alias}.{_column(name)}"
+    # Decimals are stored as text, like encode_audit_value() does, to keep their scale.
+    if Shift._meta.get_field(name).get_internal_type() == "DecimalField":
+        value += "::text"
+    return f"to_jsonb({value})"
+
+
+def _audit_sql(values=("%s", "%s", "%s")):
+    """Insert the audit rows for the ``old`` and ``up`` CTEs; ``values`` fill id, created, modified."""
+    changes = ", ".join(
+        f"('{name}', {1 << bit}, {_audit_value_sql('old', name)}, "
+        f"old.{_column(name)} IS DISTINCT FROM up.{_column(name)})"
+        for bit, name in enumerate(AUDITED_FIELDS)
+    )
+    audit_fields = ("id", "created", "modified", "shift", "attendance_date", "changed_fields", "diff")
+    audit_columns = ", ".join(_column(name, ShiftAudit) for name in audit_fields)
+    return (
+        f"INSERT INTO {_table(ShiftAudit)} ({audit_columns}) "
+        f"SELECT {', '.join(values)}, old.{_column('id')}, old.{_column('attendance_date')}, delta.mask, delta.diff "
+        f"FROM old JOIN up ON up.{_column('id')} = old.{_column('id')} "
+        f"CROSS JOIN LATERAL ("
+        f"SELECT sum(c.bit)::integer AS mask, jsonb_object_agg(c.name, c.value) AS diff "
+        f"FROM (VALUES {changes}) AS c(name, bit, value, changed) WHERE c.changed"
+        f") AS delta WHERE delta.mask IS NOT NULL"
+    )
+
+
+def upsert_staff_shift(staff, data):
+    """Create or update one of ``staff``'s shifts in a single statement.
+
+    The statement locks the existing row, upserts it and writes the audit row
+    for the previous values, so concurrent PATCHes for the same date serialize
+    on the row instead of racing into an IntegrityError. Model validation runs
+    on the returned row and rolls the write back if it fails.
+
+    A row inserted by another transaction after this statement's snapshot is
+    updated correctly but not audited, since its old values are not visible.
+    """
+    now = timezone.now()
+    # Placeholders keep the NOT NULL columns satisfied when the row already
+    # exists and only a subset of fields is sent.
+    shift = Shift(id=uuid.uuid4(), created=now, modified=now, recorded_by_staff=staff, shift_type="", status="")
+    for field, value in data.items():
+        setattr(shift, field, value)
+    update_fields = tuple(name for name in UPSERT_FIELDS if name in data)
+
+    params = [staff.pk, shift.attendance_date, *_insert_params(shift)]
+    if python_audit_enabled():
+        params += [uuid.uuid4(), now, now]
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_single_upsert_sql(update_fields), params)
+            *values, inserted = cursor.fetchone()
+        shift = Shift.from_db(connection.alias, [field.attname for field in Shift._meta.concrete_fields], values)
+        if inserted and ("shift_type" not in data or "status" not in data):
+            raise ValidationError("shift_type and status are required to create a shift")
+        shift.full_clean(
+            exclude=["recorded_by_worker", "recorded_by_staff"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+    return shift
@@ -1,12 +1,38 @@
 from django.urls import path
 
+from shifts.views.staff.as_of import StaffShiftAsOfView, StaffShiftDetailAsOfView
+from shifts.views.staff.bulk import StaffShiftBulkUpsertView
+from shifts.views.staff.export import StaffShiftExportView
+from shifts.views.staff.history import StaffCompanyShiftHistoryView, StaffShiftHistoryView
+from shifts.views.staff.imports import StaffShiftImportView
+from shifts.views.staff.matrix import StaffShiftMatrixView
 from shifts.views.staff.shift import StaffShiftDetailView, StaffShiftUpsertView
+from shifts.views.staff.summary import StaffShiftSummaryView
+from shifts.views.staff.sync import StaffShiftSyncView
 
 urlpatterns = [
     path("api/v1/staff/shifts/", StaffShiftUpsertView.as_view(), name="staff-shift-upsert"),
+    path("api/v1/staff/shifts/bulk/", StaffShiftBulkUpsertView.as_view(), name="staff-shift-bulk-upsert"),
+    path("api/v1/staff/shifts/export/", StaffShiftExportView.as_view(), name="staff-shift-export"),
+    path("api/v1/staff/shifts/import/", StaffShiftImportView.as_view(), name="staff-shift-import"),
+    path("api/v1/staff/shifts/as-of/", StaffShiftAsOfView.as_view(), name="staff-shift-as-of"),
+    path("api/v1/staff/shifts/history/", StaffCompanyShiftHistoryView.as_view(), name="staff-company-shift-history"),
+    path("api/v1/staff/shifts/summary/", StaffShiftSummaryView.as_view(), name="staff-shift-summary"),
+    path("api/v1/staff/shifts/matrix/", StaffShiftMatrixView.as_view(), name="staff-shift-matrix"),
+    path("api/v1/staff/shifts/sync/", StaffShiftSyncView.as_view(), name="staff-shift-sync"),
     path(
         "api/v1/staff/shifts/<uuid:shift_id>/",
         StaffShiftDetailView.as_view(),
         name="staff-shift-detail",
     ),
+    path(
+        "api/v1/staff/shifts/<uuid:shift_id>/as-of/",
+        StaffShiftDetailAsOfView.as_view(),
+        name="staff-shift-detail-as-of",
+    ),
+    path(
+        "api/v1/staff/shifts/<uuid:shift_id>/history/",
+        StaffShiftHistoryView.as_view(),
+        name="staff-shift-history",
+    ),
 ]
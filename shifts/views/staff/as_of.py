@@ -0,0 +1,112 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.models import Shift
+from shifts.views.staff.shift import ShiftSerializer
+
+
+class ShiftAsOfSerializer(serializers.Serializer):
+    at = serializers.DateTimeField(required=True)
+
+    def validate_at(self, value):
+        # Audit rows older than the retention window may have been archived,
+        # and as_of() only reads the hot table.
+        oldest = timezone.now() - datetime.timedelta(days=settings.SHIFT_AUDIT_RETENTION_DAYS)
+        if value < oldest:
+            raise serializers.ValidationError(f"at must be within the last {settings.SHIFT_AUDIT_RETENTION_DAYS} days.")
+        return value
+
+
+class ShiftRangeAsOfSerializer(ShiftAsOfSerializer):
+    date_from = serializers.DateField(required=True)
+    date_to = serializers.DateField(required=True)
+
+    def validate(self, attrs):
+        span = (attrs["date_to"] - attrs["date_from"]).days
+        if span < 0:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        if span >= settings.SHIFT_AS_OF_MAX_DAYS:
+            raise serializers.ValidationError(
+                {"date_to": f"Date range must not exceed {settings.SHIFT_AS_OF_MAX_DAYS} days."}
+            )
+        return attrs
+
+
+class StaffShiftAsOfView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ShiftRangeAsOfSerializer
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = serializer.validated_data
+        shifts = Shift.objects.for_company(staff.company_id).as_of(
+            params["at"],
+            date_from=params["date_from"],
+            date_to=params["date_to"],
+        )
+        return api_response(
+            ok=True,
+            message="Shift list as of",
+            data=ShiftSerializer(shifts, many=True).data,
+        )
+
+
+class StaffShiftDetailAsOfView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ShiftAsOfSerializer
+
+    def get(self, request, shift_id):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        shifts = Shift.objects.for_company(staff.company_id).filter(id=shift_id)
+        shift = next(iter(shifts.as_of(serializer.validated_data["at"])), None)
+        if shift is None:
+            return api_response(
+                ok=False,
+                message="Shift not found",
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return api_response(
+            ok=True,
+            message="Shift detail as of",
+            data=ShiftSerializer(shift).data,
+        )
@@ -0,0 +1,75 @@
+from django.conf import settings
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.upsert import bulk_upsert_staff_shifts
+from shifts.views.staff.shift import ShiftSerializer, StaffShiftUpsertSerializer
+
+
+class StaffShiftBulkUpsertSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.SHIFT_BULK_MAX_ITEMS,
+    )
+
+
+class StaffShiftBulkUpsertView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = StaffShiftBulkUpsertSerializer
+
+    def patch(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        items = serializer.validated_data["items"]
+        results = [None] * len(items)
+        valid_items = []
+        for index, payload in enumerate(items):
+            item_serializer = StaffShiftUpsertSerializer(data=payload)
+            if item_serializer.is_valid():
+                valid_items.append((index, item_serializer.validated_data))
+            else:
+                results[index] = {"ok": False, "errors": item_serializer.errors}
+
+        if valid_items:
+            saved = bulk_upsert_staff_shifts(staff, [item for _, item in valid_items])
+            for (index, _), result in zip(valid_items, saved):
+                results[index] = result
+
+        for index, result in enumerate(results):
+            result["index"] = index
+            shift = result.pop("shift", None)
+            if shift is not None:
+                result["data"] = ShiftSerializer(shift).data
+
+        saved_count = sum(result["ok"] for result in results)
+        if saved_count == len(results):
+            message, response_status = "Shifts saved", status.HTTP_200_OK
+        elif saved_count:
+            message, response_status = "Some shifts were not saved", status.HTTP_207_MULTI_STATUS
+        else:
+            message, response_status = "No shifts were saved", status.HTTP_400_BAD_REQUEST
+        return api_response(
+            ok=saved_count == len(results),
+            message=message,
+            data=results,
+            status=response_status,
+        )
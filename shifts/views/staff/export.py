@@ -0,0 +1,67 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.export import EXPORT_FIELDS, iter_csv, iter_ndjson, iter_ndjson_columns
+from shifts.filters import ShiftFieldsSerializer, ShiftFilterSerializer
+from shifts.models import Shift
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
+
+
+class StaffShiftExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        # ``format`` is reserved by DRF for renderer negotiation.
+        file_format = request.query_params.get("file_format", "ndjson")
+        if file_format not in EXPORT_FORMATS:
+            return api_response(
+                ok=False,
+                message="Unsupported export format",
+                errors={"file_format": [f"Choose one of: {', '.join(EXPORT_FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = ShiftFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid filters",
+                errors=filters.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fieldset = ShiftFieldsSerializer(data=request.query_params)
+        if not fieldset.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid fields",
+                errors=fieldset.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        shifts = filters.filter_queryset(Shift.objects.for_company(staff.company_id))
+        shifts = shifts.order_by("-attendance_date", "-id")
+        fields = [name for name in EXPORT_FIELDS if name in fieldset.validated_data.get("fields", EXPORT_FIELDS)]
+        stream, content_type = EXPORT_FORMATS[file_format]
+        # CSV already sends the column names once.
+        if file_format == "ndjson" and fieldset.validated_data["layout"] == "columnar":
+            stream = iter_ndjson_columns
+        response = StreamingHttpResponse(stream(shifts, fields), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="shifts.{file_format}"'
+        return response
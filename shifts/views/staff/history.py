@@ -0,0 +1,92 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.archive import archived_history
+from shifts.history import history_page
+from shifts.models import Shift, ShiftAudit
+from shifts.pagination import InvalidCursor, encode_cursor, parse_page_size
+
+
+def _history_response(request, audits, shift=None):
+    """Page ``audits``; with ``include_archived=true``, continue into ``shift``'s archived entries."""
+    include_archived = shift is not None and request.query_params.get("include_archived") in ("1", "true")
+    try:
+        page_size = parse_page_size(
+            request.query_params.get("page_size"),
+            default=settings.SHIFT_LIST_PAGE_SIZE,
+            maximum=settings.SHIFT_LIST_MAX_PAGE_SIZE,
+        )
+        entries, next_cursor = history_page(
+            audits,
+            page_size=page_size,
+            cursor=request.query_params.get("cursor"),
+        )
+        if include_archived and next_cursor is None:
+            # Archived rows are all older than the hot ones, so the same keyset
+            # cursor carries on into the archive.
+            cursor = request.query_params.get("cursor")
+            if entries:
+                cursor = encode_cursor([entries[-1]["created"].isoformat(), str(entries[-1]["id"])])
+            if len(entries) < page_size:
+                archived, next_cursor = archived_history(shift, limit=page_size - len(entries), cursor=cursor)
+                entries += archived
+            else:
+                next_cursor = cursor
+    except InvalidCursor as exc:
+        return api_response(
+            ok=False,
+            message=str(exc),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return api_response(
+        ok=True,
+        message="Shift history",
+        data={
+            "results": entries,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+class StaffShiftHistoryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, shift_id):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        shift = Shift.objects.for_company(staff.company_id).filter(id=shift_id).first()
+        if shift is None:
+            return api_response(
+                ok=False,
+                message="Shift not found",
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return _history_response(request, ShiftAudit.objects.filter(shift_id=shift_id), shift)
+
+
+class StaffCompanyShiftHistoryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        shifts = Shift.objects.for_company(staff.company_id).values("id")
+        return _history_response(request, ShiftAudit.objects.filter(shift__in=shifts))
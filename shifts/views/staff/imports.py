@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from rest_framework import serializers, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.imports import IMPORT_FORMATS, ShiftImport, iter_rows
+
+
+class StaffShiftImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    # ``format`` is reserved by DRF for renderer negotiation.
+    file_format = serializers.ChoiceField(choices=IMPORT_FORMATS, required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if "file_format" not in attrs:
+            suffix = Path(attrs["file"].name).suffix.lstrip(".").lower()
+            if suffix not in IMPORT_FORMATS:
+                raise serializers.ValidationError({"file_format": [f"Choose one of: {', '.join(IMPORT_FORMATS)}."]})
+            attrs["file_format"] = suffix
+        return attrs
+
+
+class StaffShiftImportView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+    serializer_class = StaffShiftImportSerializer
+
+    def post(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = serializer.validated_data
+        report = ShiftImport(staff.company_id, dry_run=params["dry_run"]).run(
+            iter_rows(params["file"], params["file_format"])
+        )
+
+        if not report["error_count"]:
+            message, response_status = "Shifts imported", status.HTTP_200_OK
+        elif report["valid"]:
+            message, response_status = "Some rows were not imported", status.HTTP_207_MULTI_STATUS
+        else:
+            message, response_status = "No rows were imported", status.HTTP_400_BAD_REQUEST
+        return api_response(
+            ok=not report["error_count"],
+            message=message,
+            data=report,
+            status=response_status,
+        )
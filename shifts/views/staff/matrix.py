@@ -0,0 +1,52 @@
+from django.http import HttpResponse
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.matrix import build_matrix, matrix_csv
+from shifts.models import Shift
+
+MATRIX_FORMATS = ("json", "csv")
+
+
+class ShiftMatrixSerializer(serializers.Serializer):
+    month = serializers.DateField(required=True, input_formats=["%Y-%m"])
+    # ``format`` is reserved by DRF for renderer negotiation.
+    file_format = serializers.ChoiceField(choices=MATRIX_FORMATS, required=False, default="json")
+
+
+class StaffShiftMatrixView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ShiftMatrixSerializer
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = serializer.validated_data
+        matrix = build_matrix(Shift.objects.for_company(staff.company_id), params["month"])
+        if params["file_format"] == "csv":
+            response = HttpResponse(matrix_csv(matrix), content_type="text/csv")
+            response["Content-Disposition"] = f'attachment; filename="attendance-{matrix["month"]}.csv"'
+            return response
+        return api_response(
+            ok=True,
+            message="Attendance matrix",
+            data=matrix,
+        )
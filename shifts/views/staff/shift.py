@@ -1,10 +1,17 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from accounts.models.staff import Staff
 from core.responses import api_response
-from shifts.models import Shift
+from shifts.conditional import Validators
+from shifts.filters import ShiftFieldsSerializer, ShiftFilterSerializer
+from shifts.models import Shift, ShiftTombstone
+from shifts.pagination import InvalidCursor, ShiftKeysetPaginator
+from shifts.rows import RowSerializer
+from shifts.upsert import upsert_staff_shift
 
 
 class StaffShiftUpsertSerializer(serializers.Serializer):
@@ -25,6 +32,17 @@ class ShiftSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+# Same output as ShiftSerializer, from values_list() rows; used for reads.
+SHIFT_ROWS = RowSerializer(ShiftSerializer)
+
+
+def shift_rows(fieldset):
+    """Return the row serializer for a validated ShiftFieldsSerializer."""
+    if "fields" in fieldset.validated_data:
+        return SHIFT_ROWS.project(fieldset.validated_data["fields"])
+    return SHIFT_ROWS
+
+
 class StaffShiftUpsertView(APIView):
     permission_classes = [IsAuthenticated]
     serializer_class = StaffShiftUpsertSerializer
@@ -38,11 +56,56 @@ class StaffShiftUpsertView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        shifts = Shift.objects.all().order_by("-attendance_date")
-        return api_response(
-            ok=True,
-            message="Shift list",
-            data=ShiftSerializer(shifts, many=True).data,
+        filters = ShiftFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid filters",
+                errors=filters.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fieldset = ShiftFieldsSerializer(data=request.query_params)
+        if not fieldset.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid fields",
+                errors=fieldset.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = shift_rows(fieldset)
+        shifts = filters.filter_queryset(Shift.objects.for_company(staff.company_id))
+        validators = Validators.for_queryset(request, shifts)
+        response = validators.not_modified(request)
+        if response is not None:
+            return response
+
+        try:
+            # The cursor keys ride along after the requested columns.
+            rows, next_cursor = ShiftKeysetPaginator().paginate(
+                shifts.values_list(*serializer.fields, "attendance_date", "id"),
+                request.query_params,
+                key=lambda row: (row[-2], row[-1]),
+            )
+        except InvalidCursor as exc:
+            return api_response(
+                ok=False,
+                message=str(exc),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if fieldset.validated_data["layout"] == "columnar":
+            data = serializer.to_columns(rows)
+        else:
+            data = {"results": serializer.to_representation(rows)}
+        data["next_cursor"] = next_cursor
+        return validators.apply(
+            api_response(
+                ok=True,
+                message="Shift list",
+                data=data,
+            )
         )
 
     def patch(self, request):
@@ -63,32 +126,22 @@ class StaffShiftUpsertView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        attendance_date = serializer.validated_data["attendance_date"]
-        shift = Shift.objects.filter(
-            recorded_by_staff=staff,
-            attendance_date=attendance_date,
-        ).first()
-
-        if shift is None:
-            if "shift_type" not in serializer.validated_data or "status" not in serializer.validated_data:
+        try:
+            shift = upsert_staff_shift(staff, serializer.validated_data)
+        except ValidationError as exc:
+            if hasattr(exc, "error_dict"):
                 return api_response(
                     ok=False,
-                    message="shift_type and status are required to create a shift",
+                    message="Invalid shift",
+                    errors=exc.message_dict,
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            shift = Shift(
-                recorded_by_staff=staff,
-                attendance_date=attendance_date,
+            return api_response(
+                ok=False,
+                message=exc.messages[0],
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        for field, value in serializer.validated_data.items():
-            if field == "attendance_date":
-                continue
-            setattr(shift, field, value)
-
-        shift.full_clean()
-        shift.save()
-
         return api_response(
             ok=True,
             message="Shift saved",
@@ -108,18 +161,40 @@ class StaffShiftDetailView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        shift = Shift.objects.filter(id=shift_id).first()
-        if shift is None:
+        fieldset = ShiftFieldsSerializer(data=request.query_params)
+        if not fieldset.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid fields",
+                errors=fieldset.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = shift_rows(fieldset)
+        shifts = Shift.objects.for_company(staff.company_id).filter(id=shift_id)
+        row = shifts.values_list(*serializer.fields, "modified").first()
+        if row is None:
             return api_response(
                 ok=False,
                 message="Shift not found",
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return api_response(
-            ok=True,
-            message="Shift detail",
-            data=ShiftSerializer(shift).data,
+        validators = Validators.for_row(request, shift_id, row[-1])
+        response = validators.not_modified(request)
+        if response is not None:
+            return response
+
+        if fieldset.validated_data["layout"] == "columnar":
+            data = serializer.to_columns([row])
+        else:
+            data = serializer.to_representation([row])[0]
+        return validators.apply(
+            api_response(
+                ok=True,
+                message="Shift detail",
+                data=data,
+            )
         )
 
     def delete(self, request, shift_id):
@@ -153,7 +228,13 @@ class StaffShiftDetailView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        shift.delete()
+        with transaction.atomic():
+            shift.delete()
+            ShiftTombstone.objects.create(
+                shift_id=shift_id,
+                attendance_date=shift.attendance_date,
+                company_id=staff.company_id,
+            )
         return api_response(
             ok=True,
             message="Shift deleted",
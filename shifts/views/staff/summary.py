@@ -0,0 +1,90 @@
+import datetime
+
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.models import ShiftMonthSummary
+from shifts.summary import SUMMARY_FIELDS, year_totals
+
+
+class ShiftSummaryQuerySerializer(serializers.Serializer):
+    month = serializers.DateField(required=False, input_formats=["%Y-%m"])
+    year = serializers.IntegerField(required=False, min_value=1900, max_value=9999)
+    worker = serializers.UUIDField(required=False)
+    staff = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if ("month" in attrs) == ("year" in attrs):
+            raise serializers.ValidationError({"month": "Provide either month (YYYY-MM) or year."})
+        return attrs
+
+
+class ShiftYearSummarySerializer(serializers.Serializer):
+    company = serializers.UUIDField(allow_null=True)
+    worker = serializers.UUIDField(allow_null=True)
+    staff = serializers.UUIDField(allow_null=True)
+    shifts = serializers.IntegerField()
+    present = serializers.IntegerField()
+    absent = serializers.IntegerField()
+    day_shifts = serializers.IntegerField()
+    night_shifts = serializers.IntegerField()
+    hours = serializers.DecimalField(max_digits=11, decimal_places=2)
+    absent_sick = serializers.IntegerField()
+    absent_site_out = serializers.IntegerField()
+    absent_no_work = serializers.IntegerField()
+    absent_safety = serializers.IntegerField()
+    absent_training = serializers.IntegerField()
+
+
+class ShiftSummarySerializer(ShiftYearSummarySerializer):
+    month = serializers.DateField(format="%Y-%m")
+
+
+class StaffShiftSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ShiftSummaryQuerySerializer
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return api_response(
+                ok=False,
+                message="Missing or invalid data",
+                errors=serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = serializer.validated_data
+        summaries = ShiftMonthSummary.objects.filter(company_id=staff.company_id)
+        if "worker" in params:
+            summaries = summaries.filter(worker_id=params["worker"])
+        if "staff" in params:
+            summaries = summaries.filter(staff_id=params["staff"])
+
+        if "month" in params:
+            rows = (
+                summaries.filter(month=params["month"])
+                .order_by("worker", "staff")
+                .values("company", "worker", "staff", "month", *SUMMARY_FIELDS)
+            )
+            data = ShiftSummarySerializer(rows, many=True).data
+        else:
+            year = params["year"]
+            rows = year_totals(summaries.filter(month__range=(datetime.date(year, 1, 1), datetime.date(year, 12, 1))))
+            data = ShiftYearSummarySerializer(rows, many=True).data
+        return api_response(
+            ok=True,
+            message="Shift summary",
+            data=data,
+        )
@@ -0,0 +1,78 @@
+from django.conf import settings
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.models.staff import Staff
+from core.responses import api_response
+from shifts.filters import ShiftFieldsSerializer
+from shifts.models import Shift, ShiftTombstone
+from shifts.pagination import InvalidCursor, parse_page_size
+from shifts.sync import TOMBSTONE_FIELDS, changes_since
+from shifts.views.staff.shift import SHIFT_ROWS
+
+
+class ShiftTombstoneSerializer(serializers.Serializer):
+    id = serializers.UUIDField(source="shift_id")
+    attendance_date = serializers.DateField()
+    deleted = serializers.DateTimeField(source="modified")
+
+
+class StaffShiftSyncView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        staff = Staff.objects.filter(user=request.user, is_active=True).first()
+        if staff is None:
+            return api_response(
+                ok=False,
+                message="Staff access denied",
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        fieldset = ShiftFieldsSerializer(data=request.query_params)
+        if not fieldset.is_valid():
+            return api_response(
+                ok=False,
+                message="Invalid fields",
+                errors=fieldset.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Clients need the id to apply a change, whatever else they asked for.
+        serializer = SHIFT_ROWS
+        if "fields" in fieldset.validated_data:
+            serializer = SHIFT_ROWS.project([*fieldset.validated_data["fields"], "id"])
+
+        try:
+            page_size = parse_page_size(
+                request.query_params.get("page_size"),
+                default=settings.SHIFT_LIST_PAGE_SIZE,
+                maximum=settings.SHIFT_LIST_MAX_PAGE_SIZE,
+            )
+            changed, deleted, next_cursor, has_more = changes_since(
+                Shift.objects.for_company(staff.company_id),
+                ShiftTombstone.objects.filter(company_id=staff.company_id),
+                serializer.fields,
+                request.query_params.get("cursor"),
+                page_size=page_size,
+            )
+        except InvalidCursor as exc:
+            return api_response(
+                ok=False,
+                message=str(exc),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if fieldset.validated_data["layout"] == "columnar":
+            data = serializer.to_columns(changed)
+        else:
+            data = {"results": serializer.to_representation(changed)}
+        data["deleted"] = [ShiftTombstoneSerializer(dict(zip(TOMBSTONE_FIELDS, row))).data for row in deleted]
+        data["next_cursor"] = next_cursor
+        data["has_more"] = has_more
+        return api_response(
+            ok=True,
+            message="Shift changes",
+            data=data,
+        )
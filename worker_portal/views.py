@@ -1,10 +1,13 @@
-from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.contrib.auth import aauthenticate, alogin, logout, get_user_model
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.views.decorators.http import require_POST
 
+from accounts.hashing import LoginOverloaded
+from accounts.login import RETRY_AFTER
 from accounts.models.worker import Worker
+from accounts.throttle import get_login_throttle
 
 
 User = get_user_model()
@@ -16,18 +19,30 @@ def login_view(request):
 
 
 @require_POST
-def worker_login(request):
+async def worker_login(request):
     username = request.POST.get("login")
     password = request.POST.get("password")
     if not username or not password:
         return JsonResponse({"ok": False, "message": "Missing credentials"}, status=400)
 
-    user = authenticate(request, username=username, password=password)
+    throttle = get_login_throttle()
+    retry_after = await throttle.check(request, username)
+    if retry_after:
+        response = JsonResponse({"ok": False, "message": "Too many login attempts, try again later"}, status=429)
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    try:
+        user = await aauthenticate(request, username=username, password=password)
+    except LoginOverloaded:
+        response = JsonResponse({"ok": False, "message": "Too many logins in progress, try again shortly"}, status=503)
+        response["Retry-After"] = str(RETRY_AFTER)
+        return response
     if user is None:
         return JsonResponse({"ok": False, "message": "Invalid credentials"}, status=401)
-
-    login(request, user)
-    worker = Worker.objects.filter(user=user).first()
+    await throttle.reset(username)
+    await alogin(request, user)
+    worker = await Worker.objects.filter(user=user).select_related("user").afirst()
     display_name = (
         (str(worker) if worker else None)
         or user.get_full_name()